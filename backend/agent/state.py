@@ -1,6 +1,6 @@
 # Defines the data structure that flows through the LangGraph pipeline
 
-from typing import TypedDict, List, Optional
+from typing import TypedDict, Dict, List, Optional
 from pydantic import BaseModel, ConfigDict
 from enum import Enum
 
@@ -26,6 +26,7 @@ class AgentState(BaseModel):
     # Input Section
     code: str
     language: str
+    files: Dict[str, str] = {} # other project files (path -> source), used to link functions to tests
 
     # Tool
     # List of Issues
@@ -0,0 +1 @@
+# Lets pytest import the backend packages (agent, tools, storage, utils) from tests/
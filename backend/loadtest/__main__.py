@@ -0,0 +1,130 @@
+# Command line entry point, run from backend/:
+#
+#   python -m loadtest --concurrency 1,4,16,64 --duration 15 --llm-latency-ms 300
+#   python -m loadtest --target server --workers 1,2,4 --pool-sizes 10,50 --output curve.csv
+#   python -m loadtest --target url --url http://localhost:8000 --rps 5,10,20
+#
+# Every combination of workers x pool size x load level is one point of the
+# saturation curve
+
+import os
+import csv
+import json
+import asyncio
+import argparse
+import tempfile
+from dataclasses import asdict
+import httpx
+from .harness import (build_payloads, run_level, inprocess_client, start_server, stop_server,
+                      format_table)
+
+
+def int_list(value: str):
+    return [int(item) for item in value.split(',') if item]
+
+
+def float_list(value: str):
+    return [float(item) for item in value.split(',') if item]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python -m loadtest', description='Load test /api/analyze')
+    parser.add_argument('--target', choices=['inprocess', 'server', 'url'], default='inprocess',
+                        help='inprocess: ASGI app in this process, server: start uvicorn here, url: existing server')
+    parser.add_argument('--url', default='http://localhost:8000', help='base url for --target url')
+    parser.add_argument('--port', type=int, default=8765, help='port for --target server')
+    parser.add_argument('--concurrency', type=int_list, default=[1, 4, 16],
+                        help='comma separated concurrency levels (max in flight when --rps is set)')
+    parser.add_argument('--rps', type=float_list, default=None,
+                        help='comma separated target request rates, switches to open loop')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per level')
+    parser.add_argument('--workers', type=int_list, default=[1], help='uvicorn worker counts (--target server)')
+    parser.add_argument('--pool-sizes', type=int_list, default=None,
+                        help='LLM connection pool sizes to try (sets LLM_MAX_CONNECTIONS)')
+    parser.add_argument('--llm-latency-ms', type=float, default=200, help='latency of the LLM stand-in')
+    parser.add_argument('--llm-jitter-ms', type=float, default=50, help='+/- jitter of the LLM stand-in')
+    parser.add_argument('--payloads', type=int, default=100, help='number of distinct request bodies')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help='per request timeout in seconds')
+    parser.add_argument('--output', help='write the saturation curve to a .json or .csv file')
+    return parser.parse_args()
+
+
+def levels(args):
+    """
+    (concurrency, rps) pairs, open loop uses the highest concurrency as in-flight cap
+    """
+    if args.rps:
+        return [(max(args.concurrency), rps) for rps in args.rps]
+    return [(concurrency, None) for concurrency in args.concurrency]
+
+
+async def sweep(client: httpx.AsyncClient, args, payloads, workers=None, pool_size=None, server_pid=None):
+    results = []
+    for concurrency, rps in levels(args):
+        result = await run_level(client, payloads, concurrency, args.duration, rps=rps, server_pid=server_pid)
+        result.workers = workers
+        result.pool_size = pool_size
+        results.append(result)
+        print(f'  workers={workers} pool={pool_size} concurrency={concurrency} rps={rps}: '
+              f'{result.throughput_rps} req/s, p95 {result.p95_ms} ms, errors {result.error_rate:.1%}', flush=True)
+    return results
+
+
+async def main():
+    args = parse_args()
+    payloads = build_payloads(args.payloads, args.seed)
+    pool_sizes = args.pool_sizes or [None]
+    results = []
+
+    # the stand-in and a throwaway review store, for this process and any server started here
+    stub_env = {
+        'LLM_STUB_LATENCY_MS': str(args.llm_latency_ms),
+        'LLM_STUB_JITTER_MS': str(args.llm_jitter_ms),
+        'REVIEW_DB_PATH': os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'reviews.db'),
+    }
+
+    if args.target == 'url':
+        # server settings (workers, pool, stub) are whatever it was started with
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            results += await sweep(client, args, payloads)
+
+    elif args.target == 'inprocess':
+        os.environ.update(stub_env)
+        for pool_size in pool_sizes:
+            os.environ.pop('LLM_MAX_CONNECTIONS', None)
+            if pool_size:
+                os.environ['LLM_MAX_CONNECTIONS'] = str(pool_size)
+            async with inprocess_client(args.timeout) as client:
+                results += await sweep(client, args, payloads, workers=1, pool_size=pool_size)
+
+    else:
+        for workers in args.workers:
+            for pool_size in pool_sizes:
+                env = dict(stub_env)
+                if pool_size:
+                    env['LLM_MAX_CONNECTIONS'] = str(pool_size)
+                process = start_server(args.port, workers, env)
+                try:
+                    async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{args.port}', timeout=args.timeout) as client:
+                        results += await sweep(client, args, payloads, workers, pool_size, server_pid=process.pid)
+                finally:
+                    stop_server(process)
+
+    print()
+    print(format_table(results))
+
+    if args.output:
+        rows = [asdict(result) for result in results]
+        with open(args.output, 'w', newline='') as f:
+            if args.output.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=[key for key in rows[0] if key != 'status_codes'], extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, f, indent=2)
+        print(f'\nSaturation curve written to {args.output}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
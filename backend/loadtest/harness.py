@@ -0,0 +1,283 @@
+# Load generator for /api/analyze
+#
+# Targets either the ASGI app in-process or a uvicorn server (started here or
+# already running), replays a mix of request sizes and languages at a target
+# concurrency (closed loop) or RPS (open loop), and reports throughput,
+# latency percentiles, error rate and memory growth for every level
+
+import os
+import sys
+import math
+import time
+import random
+import asyncio
+import resource
+import subprocess
+from dataclasses import dataclass, asdict, field
+from typing import List, Optional
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (language, lines, weight) - mostly small snippets, some large files
+REQUEST_MIX = [
+    ('python', 20, 5),
+    ('python', 200, 3),
+    ('python', 1000, 1),
+    ('javascript', 20, 3),
+    ('javascript', 200, 2),
+    ('typescript', 200, 1),
+]
+
+# Line templates with a realistic share of analyzer candidates (secrets, TODOs, loops, ...)
+TEMPLATES = {
+    'python': [
+        'def process_item{n}(items, limit):',
+        '    result = []',
+        '    for item in items:',
+        '        if item.value > 1000 and item.ready and item.valid and not item.done:',
+        '            result.append(item.name)',
+        '    # TODO: handle empty input',
+        '    return result',
+        'api_key = "sk-{token}"',
+        'import os',
+    ],
+    'javascript': [
+        'function processItem{n}(items) {{',
+        '  const result = []',
+        '  for (let i = 0; i < items.length; i++) {{',
+        '    if (items[i].value > 1000 || items[i].ready || items[i].valid || items[i].done) result.push(items[i])',
+        '  }}',
+        '  // TODO: handle errors',
+        '  return fetch("/api/items").then(res => res.json())',
+        '}}',
+        'const token = "{token}"',
+    ],
+}
+TEMPLATES['typescript'] = TEMPLATES['javascript']
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    target_rps: Optional[float]
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    error_rate: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    rss_start_mb: Optional[float]
+    rss_end_mb: Optional[float]
+    rss_growth_mb: Optional[float]
+    workers: Optional[int] = None
+    pool_size: Optional[int] = None
+    status_codes: dict = field(default_factory=dict)
+
+
+def build_payloads(count: int, seed: int = 0) -> List[dict]:
+    """
+    Deterministic list of request bodies following REQUEST_MIX
+    """
+    rng = random.Random(seed)
+    weights = [weight for _, _, weight in REQUEST_MIX]
+    payloads = []
+
+    for n in range(count):
+        language, lines, _ = rng.choices(REQUEST_MIX, weights=weights)[0]
+        template = TEMPLATES[language]
+        code_lines = []
+        for i in range(lines):
+            token = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789') for _ in range(40))
+            code_lines.append(template[i % len(template)].format(n=i, token=token))
+        payloads.append({'code': '\n'.join(code_lines), 'language': language, 'include_issues': False})
+
+    return payloads
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Resident memory of a process and its children (Linux /proc), or of this
+    process via getrusage elsewhere. None when it cannot be measured
+    """
+    pid = pid or os.getpid()
+
+    def read(p: int) -> float:
+        with open(f'/proc/{p}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+    def children(p: int) -> List[int]:
+        try:
+            with open(f'/proc/{p}/task/{p}/children') as f:
+                return [int(child) for child in f.read().split()]
+        except OSError:
+            return []
+
+    try:
+        total = read(pid)
+        for child in children(pid):
+            total += read(child)
+        return round(total, 1)
+    except OSError:
+        if pid != os.getpid():
+            return None
+        # ru_maxrss is a peak in KB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+async def run_level(client: httpx.AsyncClient, payloads: List[dict], concurrency: int,
+                    duration: float, rps: Optional[float] = None, server_pid: Optional[int] = None) -> LevelResult:
+    """
+    Runs one load level. Closed loop: `concurrency` clients send back to back.
+    Open loop (rps set): requests start on a fixed schedule, at most `concurrency` in flight
+    """
+    latencies: List[float] = []
+    status_codes: dict = {}
+    errors = 0
+    counter = 0
+
+    async def send(start: Optional[float] = None) -> None:
+        """
+        `start` is the scheduled start in the open loop, so time spent queued behind
+        the concurrency cap counts as latency (no coordinated omission)
+        """
+        nonlocal errors, counter
+        payload = payloads[counter % len(payloads)]
+        counter += 1
+
+        if start is None:
+            start = time.perf_counter()
+        try:
+            response = await client.post('/api/analyze', json=payload)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        status_codes[status] = status_codes.get(status, 0) + 1
+        if status != 200:
+            errors += 1
+
+    rss_start = rss_mb(server_pid)
+    started = time.perf_counter()
+    deadline = started + duration
+
+    if rps:
+        in_flight = asyncio.Semaphore(concurrency)
+        tasks = []
+
+        async def scheduled(start: float):
+            async with in_flight:
+                await send(start)
+
+        next_start = started
+        while next_start < deadline:
+            await asyncio.sleep(max(0.0, next_start - time.perf_counter()))
+            tasks.append(asyncio.create_task(scheduled(next_start)))
+            next_start += 1 / rps
+        await asyncio.gather(*tasks)
+    else:
+        async def worker():
+            while time.perf_counter() < deadline:
+                await send()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - started
+    rss_end = rss_mb(server_pid)
+    latencies.sort()
+    total = len(latencies)
+
+    return LevelResult(
+        concurrency=concurrency,
+        target_rps=rps,
+        requests=total,
+        errors=errors,
+        duration_s=round(elapsed, 2),
+        throughput_rps=round(total / elapsed, 2) if elapsed else 0.0,
+        error_rate=round(errors / total, 4) if total else 0.0,
+        p50_ms=round(percentile(latencies, 50), 1),
+        p95_ms=round(percentile(latencies, 95), 1),
+        p99_ms=round(percentile(latencies, 99), 1),
+        max_ms=round(latencies[-1], 1) if latencies else 0.0,
+        rss_start_mb=rss_start,
+        rss_end_mb=rss_end,
+        rss_growth_mb=round(rss_end - rss_start, 1) if rss_start is not None and rss_end is not None else None,
+        status_codes={str(code): count for code, count in status_codes.items()},
+    )
+
+
+def inprocess_client(timeout: float) -> httpx.AsyncClient:
+    """
+    Client bound to the ASGI app, no sockets involved. The stub settings must
+    be in the environment before this is called
+    """
+    from utils.llm import set_client
+    from loadtest.stub_llm import stub_from_env
+    set_client(stub_from_env())
+
+    from main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://loadtest', timeout=timeout)
+
+
+def start_server(port: int, workers: int, env: dict) -> subprocess.Popen:
+    """
+    Starts uvicorn with the stand-in (loadtest/server.py) on localhost and waits until /health answers
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'loadtest.server:app', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+    )
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'uvicorn exited with code {process.returncode}')
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/health', timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError('uvicorn did not become healthy within 30s')
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def format_table(results: List[LevelResult]) -> str:
+    columns = ['workers', 'pool_size', 'concurrency', 'target_rps', 'requests', 'throughput_rps',
+               'error_rate', 'p50_ms', 'p95_ms', 'p99_ms', 'rss_growth_mb']
+    rows = [[str(asdict(result)[column] if asdict(result)[column] is not None else '-') for column in columns]
+            for result in results]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+
+    lines = ['  '.join(column.rjust(width) for column, width in zip(columns, widths))]
+    for row in rows:
+        lines.append('  '.join(value.rjust(width) for value, width in zip(row, widths)))
+    return '\n'.join(lines)
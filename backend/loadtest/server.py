@@ -0,0 +1,9 @@
+# The API with the LLM stand-in installed, started by the harness as
+#   uvicorn loadtest.server:app
+# Every uvicorn worker imports this module and gets its own stand-in
+
+from main import app
+from utils.llm import set_client
+from loadtest.stub_llm import stub_from_env
+
+set_client(stub_from_env())
@@ -0,0 +1,94 @@
+# Stand-in for the OpenAI client used during load tests
+#
+# Mimics client.beta.chat.completions.parse with a configurable latency, so the
+# service can be measured without paying for (or being rate limited by) the API
+
+import os
+import time
+import random
+import threading
+from types import SimpleNamespace
+from typing import Optional
+from agent.state import Issue, Severity
+from tools.cascade import Verdict
+
+SEVERITIES = list(Severity)
+
+
+def _fake_parsed(response_format, rng: random.Random):
+    if response_format is Verdict:
+        return Verdict(
+            is_issue=rng.random() < 0.7,
+            confidence=round(rng.uniform(0.3, 1.0), 2),
+            severity=rng.choice(SEVERITIES),
+            message='Stub verdict',
+            suggestion='Stub suggestion'
+        )
+
+    if response_format is Issue:
+        return Issue(
+            type='stub',
+            severity=rng.choice(SEVERITIES),
+            message='Stub issue',
+            line_number=None,
+            suggestion='Stub suggestion'
+        )
+
+    if response_format is not None:
+        return response_format.model_construct()
+
+    return None
+
+
+class _Completions:
+
+    def __init__(self, client: 'StubClient'):
+        self.client = client
+
+    def parse(self, model: str, messages: list, response_format=None, **kwargs):
+        return self.client.complete(response_format)
+
+    def create(self, model: str, messages: list, **kwargs):
+        return self.client.complete(None)
+
+
+class StubClient:
+    """
+    Sleeps instead of calling the API, max_connections emulates the HTTP pool limit
+    """
+
+    def __init__(self, latency: float, jitter: float = 0.0, max_connections: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self._pool = threading.BoundedSemaphore(max_connections) if max_connections else None
+        self._rng = random.Random()
+        self._rng_lock = threading.Lock()
+
+        completions = _Completions(self)
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        self.chat = SimpleNamespace(completions=completions)
+
+    def complete(self, response_format):
+        with self._rng_lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            parsed = _fake_parsed(response_format, self._rng)
+
+        if self._pool is not None:
+            with self._pool:
+                time.sleep(delay)
+        else:
+            time.sleep(delay)
+
+        message = SimpleNamespace(parsed=parsed, content='Stub summary of the review.', refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def stub_from_env() -> StubClient:
+    """
+    Stand-in configured by LLM_STUB_LATENCY_MS, LLM_STUB_JITTER_MS and LLM_MAX_CONNECTIONS
+    """
+    return StubClient(
+        latency=float(os.getenv('LLM_STUB_LATENCY_MS', '200')) / 1000,
+        jitter=float(os.getenv('LLM_STUB_JITTER_MS', '0')) / 1000,
+        max_connections=int(os.getenv('LLM_MAX_CONNECTIONS', '0')) or None
+    )
@@ -1,18 +1,29 @@
 # this file is the entry point that 
 
 import os
-from fastapi import FastAPI, HTTPException
+import logging
+import sqlite3
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Header
+from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from agent.graph import graph_app
 from agent.state import *
+from storage.review_store import get_store, hash_code
+from tools.cascade import CASCADE_STATS
+from utils import profiling
 
 load_dotenv() 
 api_key = os.getenv("OPENAI_API_KEY")
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="AI Code Review Agent") # creating the app
 
+MAX_FILES = int(os.getenv('MAX_FILES', '500')) # limit for CodeRequest.files
+MAX_FILES_SIZE = int(os.getenv('MAX_FILES_SIZE', '2000000')) # total characters in CodeRequest.files
+
 # allowing Next.js frontend to call backend
 app.add_middleware(
     CORSMiddleware,
@@ -26,12 +37,18 @@ app.add_middleware(
 class CodeRequest(BaseModel):
     code: str
     language: str | None = None
+    files: dict[str, str] = {} # other project files (path -> source), imports resolve against their manifests and tests are linked to the reviewed code
+    include_issues: bool = True # False skips the full issue list, fetch pages from /api/reviews instead
+    profile: bool = False # profile this request, needs the X-Profile-Token header
     
 # response based on the code requested to be reviewed
 class CodeResponse(BaseModel):
+    review_id: str | None # id of the stored review, used for paginated issue retrieval (None if it could not be stored)
+    previous_review_id: str | None = None # latest earlier review of the same code
     summary: str # summary of the code
     issues: list # issues of the code
     metrics: dict
+    profile_id: str | None = None # set when the request was profiled
 
     
 
@@ -40,8 +57,13 @@ class CodeResponse(BaseModel):
 def health_check():
     return {'status': 'health'}
 
+# Hit rate and latency of each cascade tier, per analyzer
+@app.get('/api/cascade/stats')
+def cascade_stats():
+    return CASCADE_STATS.snapshot()
+
 @app.post('/api/analyze')
-def analyze_code(request: CodeRequest):
+def analyze_code(request: CodeRequest, x_profile_token: str | None = Header(None)):
 
     # Input
     code = request.code
@@ -54,6 +76,11 @@ def analyze_code(request: CodeRequest):
     lines = len(code.split('\n'))
     if lines >= 2000:
         raise HTTPException(status_code=400, detail='Line number exceeded')
+
+    if len(request.files) > MAX_FILES:
+        raise HTTPException(status_code=400, detail=f'At most {MAX_FILES} files can be submitted')
+    if sum(len(path) + len(source) for path, source in request.files.items()) > MAX_FILES_SIZE:
+        raise HTTPException(status_code=400, detail=f'Submitted files exceed {MAX_FILES_SIZE} characters')
     
     # Detecting language if not provided
     if language is None:
@@ -64,6 +91,7 @@ def analyze_code(request: CodeRequest):
     initial_state = AgentState(
         code = code,
         language = language,
+        files = request.files,
         style_issues = [],
         security_issues = [],
         best_practices_issues = [],
@@ -78,8 +106,17 @@ def analyze_code(request: CodeRequest):
         summary = ""
     )
 
-    # Running the graph
-    final_state = graph_app.invoke(initial_state)
+    if request.profile and not profiling.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail='Profiling requires a valid X-Profile-Token')
+
+    # Running the graph (profiled on request or for a sampled share of requests)
+    profile_id = None
+    if request.profile or profiling.sampled():
+        with profiling.RequestProfile() as profile:
+            final_state = graph_app.invoke(initial_state)
+        profile_id = profile.id if profile.saved else None
+    else:
+        final_state = graph_app.invoke(initial_state)
 
     # LangGraph returns a dict, not AgentState object
     summary = final_state["summary"]
@@ -96,11 +133,81 @@ def analyze_code(request: CodeRequest):
         if severity in metrics:
             metrics[severity] += 1
 
+    issue_dicts = [issue.dict() for issue in issues]
+
+    # Persisting the review so issues can be fetched page by page later,
+    # a store failure must not throw away the analysis
+    review_id = previous_review_id = None
+    try:
+        store = get_store()
+        previous = store.find_reviews_by_hash(hash_code(code), limit=1)
+        previous_review_id = previous[0]['id'] if previous else None
+        review_id = store.save_review(code, language, summary, issue_dicts)
+    except sqlite3.Error:
+        logger.exception('Could not store review')
+
     return CodeResponse(
+        review_id = review_id,
+        previous_review_id = previous_review_id,
         summary = summary,
-        issues = [issue.dict() for issue in issues],
-        metrics = metrics
+        issues = issue_dicts if request.include_issues or review_id is None else [],
+        metrics = metrics,
+        profile_id = profile_id
     )
+
+# Paginated issues of a stored review, critical issues come first
+@app.get('/api/reviews/{review_id}/issues')
+def list_review_issues(
+    review_id: str,
+    severity: Optional[List[str]] = Query(None),
+    type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    store = get_store()
+
+    if store.get_review(review_id) is None:
+        raise HTTPException(status_code=404, detail='Review not found')
+
+    try:
+        return store.list_issues(review_id, severity=severity, issue_type=type, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Severity aggregates of a stored review
+@app.get('/api/reviews/{review_id}/metrics')
+def review_metrics(review_id: str):
+    store = get_store()
+
+    review = store.get_review(review_id)
+    if review is None:
+        raise HTTPException(status_code=404, detail='Review not found')
+
+    return {
+        'review_id': review_id,
+        'summary': review['summary'],
+        'language': review['language'],
+        'metrics': store.severity_counts(review_id),
+        'types': store.type_counts(review_id)
+    }
         
 
     
+
+# Download a stored profile: folded stacks for flamegraphs or a Chrome trace timeline
+@app.get('/api/profiles/{profile_id}')
+def download_profile(profile_id: str, format: str = Query('folded', pattern='^(folded|trace)$'),
+                     x_profile_token: str | None = Header(None)):
+
+    if not profiling.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail='Invalid profile token')
+
+    if not profiling.valid_profile_id(profile_id):
+        raise HTTPException(status_code=404, detail='Profile not found')
+
+    path = profiling.profile_path(profile_id, format)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail='Profile not found')
+
+    media_type = 'application/json' if format == 'trace' else 'text/plain'
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
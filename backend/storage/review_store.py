@@ -0,0 +1,250 @@
+# Local persistence for reviews and their issues (SQLite by default)
+
+import os
+import sqlite3
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Severity rank used for ordering, critical issues come first
+SEVERITY_RANK = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id TEXT PRIMARY KEY,
+    file_hash TEXT NOT NULL,
+    language TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    total_issues INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    review_id TEXT NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    severity_rank INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    line_number INTEGER,
+    suggestion TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_file_hash ON reviews(file_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_issues_review_severity ON issues(review_id, severity_rank, id);
+CREATE INDEX IF NOT EXISTS idx_issues_review_type ON issues(review_id, type);
+CREATE INDEX IF NOT EXISTS idx_issues_review_line ON issues(review_id, line_number);
+"""
+
+
+def hash_code(code: str) -> str:
+    """
+    Stable hash of the submitted code, used to find earlier reviews of the same file
+    """
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def encode_cursor(severity_rank: int, issue_id: int) -> str:
+    return f'{severity_rank}:{issue_id}'
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Cursor is "<severity_rank>:<issue_id>" of the last issue on the previous page
+    """
+    try:
+        rank, issue_id = cursor.split(':')
+        return int(rank), int(issue_id)
+    except ValueError:
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+
+class ReviewStore:
+    """
+    Stores every review and its issues so they can be fetched page by page
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per call, FastAPI runs sync endpoints in a thread pool
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute('PRAGMA journal_mode = WAL')
+        return conn
+
+    def save_review(self, code: str, language: str, summary: str, issues: List[dict]) -> str:
+        """
+        Persist a review with all its issues, returns the new review id
+        """
+        review_id = uuid.uuid4().hex
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        rows = []
+        for issue in issues:
+            # Issue.dict() keeps the Severity enum, store its plain value
+            severity = getattr(issue['severity'], 'value', issue['severity']).lower()
+            rows.append((
+                review_id,
+                issue['type'],
+                severity,
+                SEVERITY_RANK.get(severity, len(SEVERITY_RANK)),
+                issue['message'],
+                issue.get('line_number'),
+                issue.get('suggestion'),
+            ))
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT INTO reviews (id, file_hash, language, summary, total_issues, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (review_id, hash_code(code), language, summary, len(issues), created_at)
+                )
+                conn.executemany(
+                    'INSERT INTO issues (review_id, type, severity, severity_rank, message, line_number, suggestion) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+        finally:
+            conn.close()
+
+        return review_id
+
+    def get_review(self, review_id: str) -> Optional[dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM reviews WHERE id = ?', (review_id,)).fetchone()
+        finally:
+            conn.close()
+
+        return dict(row) if row else None
+
+    def find_reviews_by_hash(self, file_hash: str, limit: int = 10) -> List[dict]:
+        """
+        Reviews of the same code, newest first
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT * FROM reviews WHERE file_hash = ? ORDER BY created_at DESC LIMIT ?',
+                (file_hash, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return [dict(row) for row in rows]
+
+    def list_issues(self, review_id: str, severity: Optional[List[str]] = None,
+                    issue_type: Optional[str] = None, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> dict:
+        """
+        One page of issues ordered by severity (critical first), then by insertion order.
+        Returns the issues and the cursor for the next page (None on the last page)
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        query = 'SELECT id, type, severity, severity_rank, message, line_number, suggestion FROM issues WHERE review_id = ?'
+        params: list = [review_id]
+
+        if severity:
+            placeholders = ', '.join('?' for _ in severity)
+            query += f' AND severity IN ({placeholders})'
+            params.extend(s.lower() for s in severity)
+
+        if issue_type:
+            query += ' AND type = ?'
+            params.append(issue_type)
+
+        if cursor:
+            # keyset pagination, stays fast no matter how deep the page is
+            rank, last_id = decode_cursor(cursor)
+            query += ' AND (severity_rank, id) > (?, ?)'
+            params.extend([rank, last_id])
+
+        query += ' ORDER BY severity_rank, id LIMIT ?'
+        params.append(limit + 1)  # one extra row tells us if there is a next page
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last['severity_rank'], last['id'])
+
+        issues = [
+            {
+                'type': row['type'],
+                'severity': row['severity'],
+                'message': row['message'],
+                'line_number': row['line_number'],
+                'suggestion': row['suggestion'],
+            }
+            for row in rows
+        ]
+
+        return {'issues': issues, 'next_cursor': next_cursor}
+
+    def severity_counts(self, review_id: str) -> dict:
+        """
+        Severity aggregates computed in SQL, same shape as the analyze metrics
+        """
+        metrics = {'total_issues': 0, 'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT severity, COUNT(*) AS count FROM issues WHERE review_id = ? GROUP BY severity',
+                (review_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        for row in rows:
+            metrics['total_issues'] += row['count']
+            if row['severity'] in metrics:
+                metrics[row['severity']] = row['count']
+
+        return metrics
+
+    def type_counts(self, review_id: str) -> dict:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT type, COUNT(*) AS count FROM issues WHERE review_id = ? GROUP BY type',
+                (review_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return {row['type']: row['count'] for row in rows}
+
+
+_store: Optional[ReviewStore] = None
+
+
+def get_store() -> ReviewStore:
+    """
+    Shared store, path comes from REVIEW_DB_PATH (defaults to reviews.db)
+    """
+    global _store
+    if _store is None:
+        _store = ReviewStore(os.getenv('REVIEW_DB_PATH', 'reviews.db'))
+    return _store
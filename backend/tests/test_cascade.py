@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+from agent.state import Severity
+from tools.cascade import CASCADE_STATS, CHEAP_MODEL, DISMISS, STRONG_MODEL, Verdict, run_cascade
+from tools.tools import local_issue
+from utils.llm import set_client
+
+
+def verdict(is_issue=True, confidence=0.9, severity=Severity.MEDIUM):
+    return Verdict(is_issue=is_issue, confidence=confidence, severity=severity, message='m', suggestion='s')
+
+
+class FakeClient:
+    """
+    Answers every parse() call with the verdict configured for the model, records the models asked
+    """
+
+    def __init__(self, verdicts):
+        self.verdicts = verdicts
+        self.calls = []
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=self))
+
+    def parse(self, model, messages, response_format=None, **kwargs):
+        self.calls.append(model)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=self.verdicts[model]))])
+
+
+@pytest.fixture
+def client():
+    def install(verdicts):
+        fake = FakeClient(verdicts)
+        set_client(fake)
+        return fake
+
+    CASCADE_STATS.reset()
+    yield install
+    set_client(None)
+    CASCADE_STATS.reset()
+
+
+def tiers(analyzer):
+    return {tier: (stats['resolved'], stats['escalated'])
+            for tier, stats in CASCADE_STATS.snapshot()[analyzer]['tiers'].items()}
+
+
+def test_local_check_resolves_without_models(client):
+    fake = client({})
+    found = local_issue('style', 'low', 'local', 'fix')
+
+    assert run_cascade('style', 'x', 1, 'python', local_check=lambda snippet: found) is found
+    assert run_cascade('style', 'x', 1, 'python', local_check=lambda snippet: DISMISS) is None
+    assert fake.calls == []
+    assert tiers('style') == {'local': (2, 0)}
+
+
+def test_confident_cheap_verdict_stops(client):
+    fake = client({CHEAP_MODEL: verdict(confidence=0.9)})
+
+    issue = run_cascade('complexity', 'x', 3, 'python', local_check=lambda snippet: None)
+    assert issue.line_number == 3
+    assert fake.calls == [CHEAP_MODEL]
+    assert tiers('complexity') == {'local': (0, 1), CHEAP_MODEL: (1, 0)}
+
+
+def test_low_confidence_escalates(client):
+    fake = client({CHEAP_MODEL: verdict(confidence=0.2), STRONG_MODEL: verdict(is_issue=False, confidence=0.2)})
+
+    assert run_cascade('complexity', 'x', 1, 'python') is None
+    assert fake.calls == [CHEAP_MODEL, STRONG_MODEL]
+    # the last tier never escalates, even when unsure
+    assert tiers('complexity') == {CHEAP_MODEL: (0, 1), STRONG_MODEL: (1, 0)}
+
+
+def test_critical_verdict_is_double_checked(client):
+    fake = client({CHEAP_MODEL: verdict(confidence=1.0, severity=Severity.CRITICAL), STRONG_MODEL: verdict(is_issue=False)})
+
+    assert run_cascade('security', 'x', 1, 'python') is None
+    assert fake.calls == [CHEAP_MODEL, STRONG_MODEL]
+
+
+def test_critical_not_escalated_when_disabled(client):
+    fake = client({CHEAP_MODEL: verdict(confidence=1.0, severity=Severity.CRITICAL)})
+
+    assert run_cascade('complexity', 'x', 1, 'python').severity == Severity.CRITICAL
+    assert fake.calls == [CHEAP_MODEL]
@@ -0,0 +1,54 @@
+from tools.dependency_index import analyze_imports, get_project_index
+
+
+def kinds(code, language='python', **kwargs):
+    return [(finding.kind, finding.module) for finding in analyze_imports(code, language, **kwargs)]
+
+
+def test_unused_and_duplicate_imports():
+    code = 'import os\nimport json\nimport json\n\nprint(json.dumps({}))\n'
+    assert kinds(code) == [('unused', 'os'), ('duplicate', 'json')]
+
+
+def test_no_unresolved_without_project_manifest(monkeypatch):
+    # the service's own requirements.txt must never be used for user code
+    monkeypatch.delenv('PROJECT_ROOT', raising=False)
+    assert kinds('import numpy\nimport requests\n\nnumpy, requests\n') == []
+    assert get_project_index() is None
+
+
+def test_unresolved_against_submitted_requirements(monkeypatch):
+    monkeypatch.delenv('PROJECT_ROOT', raising=False)
+    files = {'requirements.txt': 'numpy==1.26\n', 'app/helpers.py': ''}
+    code = 'import numpy\nimport requests\nfrom app import helpers\n\nnumpy, requests, helpers\n'
+    assert kinds(code, files=files) == [('unresolved', 'requests')]
+
+
+def test_js_imports_against_submitted_package_json(monkeypatch):
+    monkeypatch.delenv('PROJECT_ROOT', raising=False)
+    files = {'package.json': '{"dependencies": {"react": "^18.0.0"}}'}
+    code = "import React from 'react'\nimport fs from 'node:fs'\nconst axios = require('axios')\nReact, fs, axios\n"
+    assert kinds(code, 'javascript', files=files) == [('unresolved', 'axios')]
+
+
+def test_missing_project_root_is_not_an_error(monkeypatch):
+    monkeypatch.setenv('PROJECT_ROOT', '/nonexistent')
+    assert kinds('import os\n\nos.getcwd()\n') == []
+
+
+def test_project_root_manifest(monkeypatch, tmp_path):
+    (tmp_path / 'requirements.txt').write_text('flask\n')
+    monkeypatch.setenv('PROJECT_ROOT', str(tmp_path))
+    assert kinds('import flask\nimport django\n\nflask, django\n') == [('unresolved', 'django')]
+
+
+def test_same_import_in_two_functions_is_not_a_duplicate():
+    code = 'def a():\n    import os\n    return os.sep\n\ndef b():\n    import os\n    return os.sep\n'
+    assert kinds(code) == []
+
+
+def test_pycryptodome_is_not_flagged_as_pycrypto(monkeypatch):
+    monkeypatch.delenv('PROJECT_ROOT', raising=False)
+    code = 'from Crypto.Cipher import AES\n\nAES\n'
+    assert kinds(code, files={'requirements.txt': 'pycrypto\n'}) == [('advisory', 'Crypto')]
+    assert kinds(code, files={'requirements.txt': 'pycryptodome\n'}) == []
@@ -0,0 +1,51 @@
+import re
+from tools.cascade import DISMISS
+from tools.tools import deep_nesting_blocks, documentation_local_check, find_candidates, style_local_check
+
+
+def checked(patterns, code, check, flags=0):
+    return [(line_number, check(snippet, line, column))
+            for line_number, snippet, line, column in find_candidates(patterns, code, flags)]
+
+
+def test_trailing_whitespace_is_matched_by_position():
+    results = checked([r'  +', r' +$'], 'x  = compute(a,  b)  \n', style_local_check, re.MULTILINE)
+    assert [result for _, result in results].count(DISMISS) == 2
+    assert [result.message for _, result in results if result is not DISMISS] == ['Trailing whitespace']
+
+
+def test_single_letter_assignment_is_only_certain_at_line_start():
+    pattern = [r'\b([a-hln-z])\s*=(?!=)']
+    assert [result is not None for _, result in checked(pattern, 'x = f(a=1)', documentation_local_check)] == [True, False]
+    assert checked(pattern, 'if x == y:', documentation_local_check) == []
+
+
+def test_one_issue_per_nested_block():
+    code = '\n'.join([
+        'def f():',
+        '    if a:',
+        '        for b in c:',
+        '            while d:',
+        '                x = call(1,',
+        '                         2)',
+        '',
+        '                """doc',
+        '                    text"""',
+        '                y = 2',
+        '    return 1',
+        '    if e:',
+        '        if f:',
+        '            if g:',
+        '                z = 3',
+    ])
+    assert deep_nesting_blocks(code, 'python') == [(5, 10), (15, 15)]
+
+
+def test_blank_and_continuation_lines_are_not_nesting():
+    code = 'x = [\n                1,\n                2]\n                \ny = 1 + \\\n                2\n'
+    assert deep_nesting_blocks(code, 'python') == []
+
+
+def test_js_braces_do_not_hide_nested_blocks():
+    code = 'function f() {\n    if (a) {\n        if (b) {\n            if (c) {\n                deep()\n            }\n        }\n    }\n}\n'
+    assert deep_nesting_blocks(code, 'javascript') == [(5, 5)]
@@ -0,0 +1,57 @@
+import pytest
+from storage.review_store import ReviewStore, hash_code
+
+
+def issue(severity, message, issue_type='style'):
+    return {'type': issue_type, 'severity': severity, 'message': message, 'line_number': 1, 'suggestion': None}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReviewStore(str(tmp_path / 'reviews.db'))
+
+
+@pytest.fixture
+def review_id(store):
+    issues = [issue('low', 'l1'), issue('critical', 'c1', 'security'), issue('medium', 'm1'),
+              issue('critical', 'c2', 'security'), issue('low', 'l2'), issue('high', 'h1')]
+    return store.save_review('print(1)', 'python', 'summary', issues)
+
+
+def test_pages_are_ordered_by_severity_and_cover_everything(store, review_id):
+    messages = []
+    cursor = None
+    while True:
+        page = store.list_issues(review_id, cursor=cursor, limit=2)
+        messages += [item['message'] for item in page['issues']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert messages == ['c1', 'c2', 'h1', 'm1', 'l1', 'l2']
+
+
+def test_filters(store, review_id):
+    assert [i['message'] for i in store.list_issues(review_id, severity=['LOW', 'high'])['issues']] == ['h1', 'l1', 'l2']
+    assert [i['message'] for i in store.list_issues(review_id, issue_type='security')['issues']] == ['c1', 'c2']
+
+
+def test_last_page_has_no_cursor(store, review_id):
+    assert store.list_issues(review_id, limit=6)['next_cursor'] is None
+
+
+def test_invalid_cursor(store, review_id):
+    with pytest.raises(ValueError):
+        store.list_issues(review_id, cursor='not-a-cursor')
+
+
+def test_counts(store, review_id):
+    assert store.severity_counts(review_id) == {'total_issues': 6, 'critical': 2, 'high': 1, 'medium': 1, 'low': 2}
+    assert store.type_counts(review_id) == {'style': 4, 'security': 2}
+
+
+def test_find_reviews_by_hash(store, review_id):
+    newer = store.save_review('print(1)', 'python', 'again', [])
+    store.save_review('print(2)', 'python', 'other', [])
+
+    assert [review['id'] for review in store.find_reviews_by_hash(hash_code('print(1)'))] == [newer, review_id]
+    assert [review['id'] for review in store.find_reviews_by_hash(hash_code('print(1)'), limit=1)] == [newer]
@@ -0,0 +1,91 @@
+from tools.symbol_index import SymbolIndex, parse_file, untested_definitions
+
+APP = '''
+def create_user(name):
+    return name
+
+def delete_user(uid):
+    pass
+
+def _helper():
+    pass
+
+class Store:
+    def save(self):
+        pass
+
+    def load(self):
+        pass
+
+    def __repr__(self):
+        return ''
+'''
+
+TESTS = '''
+from app import Store
+
+def test_create():
+    assert create_user('a')
+
+class TestStore:
+    def test_save(self):
+        Store().save()
+'''
+
+
+def untested(files, path='app.py'):
+    index = SymbolIndex()
+    index.update_many(files)
+    return [d.name for d in untested_definitions(index.files[path].parsed.definitions, [index])]
+
+
+def test_reports_public_definitions_without_tests():
+    assert untested({'app.py': APP, 'tests/test_app.py': TESTS}) == ['delete_user', 'Store.load']
+
+
+def test_nothing_reported_without_any_tests():
+    assert untested({'app.py': APP}) == []
+
+
+def test_js_test_blocks():
+    source = 'export function add(a, b) { return a + b }\nexport const sub = (a, b) => a - b\n'
+    tests = "import { add } from './math'\nit('adds', () => { expect(add(1, 2)).toBe(3) })\n"
+    assert untested({'math.js': source, 'math.test.js': tests}, 'math.js') == ['sub']
+
+
+def test_update_is_incremental_by_hash():
+    index = SymbolIndex()
+    files = {'app.py': APP, 'tests/test_app.py': TESTS}
+    assert index.update_many(files) == 2
+    assert index.update_many(files) == 0
+
+    # replaced test file drops its old references
+    index.update('tests/test_app.py', 'def test_load():\n    Store().load()\n')
+    definitions = index.files['app.py'].parsed.definitions
+    assert [d.name for d in untested_definitions(definitions, [index])] == ['create_user', 'delete_user', 'Store.save']
+
+
+def test_index_directory_skips_unchanged_files(tmp_path):
+    (tmp_path / 'app.py').write_text(APP)
+    (tmp_path / 'tests').mkdir()
+    (tmp_path / 'tests' / 'test_app.py').write_text(TESTS)
+
+    index = SymbolIndex()
+    assert index.index_directory(str(tmp_path)) == 2
+    assert index.index_directory(str(tmp_path)) == 0
+
+    (tmp_path / 'tests' / 'test_app.py').unlink()
+    index.index_directory(str(tmp_path))
+    assert not index.has_tests()
+
+
+def test_code_that_does_not_compile():
+    parsed = parse_file('app.py', 'def broken(:\n    pass\nclass Ok:\n    pass\n')
+    assert [d.name for d in parsed.definitions] == ['broken', 'Ok']
+
+
+def test_js_tests_with_the_same_name():
+    source = 'export const add = (a, b) => a + b\nexport const sub = (a, b) => a - b\n'
+    tests = ("describe('add', () => {\n  it('works', () => { expect(add(1, 2)).toBe(3) })\n})\n"
+             "describe('sub', () => {\n  it('works', () => { expect(sub(2, 1)).toBe(1) })\n})\n")
+    assert untested({'math.js': source, 'math.test.js': tests}, 'math.js') == []
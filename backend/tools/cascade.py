@@ -0,0 +1,189 @@
+# Tiered model cascade used by every analyzer tool
+#
+# Each regex candidate goes through the tiers in order and stops at the first
+# tier that is sure about it:
+#   1. local check   deterministic rule, free and instant
+#   2. cheap model   returns a verdict with a confidence score
+#   3. strong model  only for low-confidence or critical-severity verdicts
+#
+# Hits and latency of every tier are recorded in CASCADE_STATS
+
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Union
+from pydantic import BaseModel, Field
+from agent.state import Issue, Severity
+from utils.llm import get_client
+from utils.profiling import span
+
+CHEAP_MODEL = os.getenv('CASCADE_CHEAP_MODEL', 'gpt-5-nano')
+STRONG_MODEL = os.getenv('CASCADE_STRONG_MODEL', 'gpt-5-mini')
+
+# Candidates longer than this are cut before they are sent to a model
+MAX_SNIPPET_CHARS = 2000
+
+# Per analyzer settings
+#   models:             model tiers in escalation order
+#   min_confidence:     verdicts below this go to the next tier
+#   escalate_critical:  critical verdicts are always double-checked by the next tier
+CASCADE_CONFIG: Dict[str, dict] = {
+    'security':       {'expert': 'security',       'models': [CHEAP_MODEL, STRONG_MODEL], 'min_confidence': 0.8, 'escalate_critical': True},
+    'style':          {'expert': 'style',          'models': [CHEAP_MODEL],               'min_confidence': 0.0, 'escalate_critical': False},
+    'complexity':     {'expert': 'complexity',     'models': [CHEAP_MODEL, STRONG_MODEL], 'min_confidence': 0.5, 'escalate_critical': False},
+    'best_practices': {'expert': 'best practices', 'models': [CHEAP_MODEL, STRONG_MODEL], 'min_confidence': 0.6, 'escalate_critical': True},
+    'performance':    {'expert': 'performance',    'models': [CHEAP_MODEL, STRONG_MODEL], 'min_confidence': 0.6, 'escalate_critical': True},
+    'accessibility':  {'expert': 'accessibility',  'models': [CHEAP_MODEL, STRONG_MODEL], 'min_confidence': 0.5, 'escalate_critical': False},
+    'dependency':     {'expert': 'dependency',     'models': [CHEAP_MODEL, STRONG_MODEL], 'min_confidence': 0.6, 'escalate_critical': True},
+    'documentation':  {'expert': 'documentation',  'models': [CHEAP_MODEL],               'min_confidence': 0.0, 'escalate_critical': False},
+}
+
+# Returned by a local check to drop a candidate without asking any model
+DISMISS = object()
+
+LocalCheck = Callable[[str], Union[Issue, object, None]]
+
+
+class Verdict(BaseModel):
+    is_issue: bool
+    confidence: float = Field(description='How sure you are about this verdict, from 0.0 to 1.0')
+    severity: Severity
+    message: str
+    suggestion: Optional[str]
+
+
+class CascadeStats:
+    """
+    Thread-safe counters per analyzer and tier
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, dict]] = {}
+        self._candidates: Dict[str, int] = {}
+
+    def candidate(self, analyzer: str):
+        with self._lock:
+            self._candidates[analyzer] = self._candidates.get(analyzer, 0) + 1
+
+    def record(self, analyzer: str, tier: str, resolved: bool, latency: float):
+        with self._lock:
+            stats = self._tiers.setdefault(analyzer, {}).setdefault(
+                tier, {'calls': 0, 'resolved': 0, 'escalated': 0, 'total_latency': 0.0}
+            )
+            stats['calls'] += 1
+            stats['resolved' if resolved else 'escalated'] += 1
+            stats['total_latency'] += latency
+
+    def snapshot(self) -> dict:
+        """
+        Hit rate = share of an analyzer's candidates resolved at that tier
+        """
+        with self._lock:
+            result = {}
+            for analyzer, tiers in self._tiers.items():
+                candidates = self._candidates.get(analyzer, 0)
+                result[analyzer] = {'candidates': candidates, 'tiers': {}}
+                for tier, stats in tiers.items():
+                    result[analyzer]['tiers'][tier] = {
+                        'calls': stats['calls'],
+                        'resolved': stats['resolved'],
+                        'escalated': stats['escalated'],
+                        'hit_rate': round(stats['resolved'] / candidates, 3) if candidates else 0.0,
+                        'avg_latency_ms': round(stats['total_latency'] / stats['calls'] * 1000, 1),
+                    }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._tiers.clear()
+            self._candidates.clear()
+
+
+CASCADE_STATS = CascadeStats()
+
+
+def _ask_model(model: str, analyzer: str, expert: str, snippet: str, line_number: int,
+               language: str, context: Optional[str]) -> Verdict:
+    hint = f'\nContext: {context}' if context else ''
+
+    with span(model, 'llm'):
+        response = get_client().beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {'role':'system', 'content': f'You are a {expert} expert'},
+                {'role':'user', 'content':
+                f"""
+                Analyze this {language} code for {expert} issues.
+                Code: {snippet[:MAX_SNIPPET_CHARS]}
+                Line: {line_number}{hint}
+
+                Return JSON with:
+                - is_issue: false if this is not a real {expert} issue
+                - confidence: how sure you are, from 0.0 to 1.0
+                - severity: MUST be exactly one of "critical", "high", "medium", or "low"
+                - message: description
+                - suggestion: how to fix
+
+                Severity guidelines:
+                - critical: security vulnerabilities, data loss risks
+                - high: bugs that break functionality
+                - medium: bad practices, performance issues
+                - low: style issues, minor improvements
+                """}
+            ],
+            response_format = Verdict, # json format
+        )
+
+    return response.choices[0].message.parsed
+
+
+def run_cascade(analyzer: str, snippet: str, line_number: int, language: str,
+                local_check: Optional[LocalCheck] = None, context: Optional[str] = None) -> Optional[Issue]:
+    """
+    Runs one candidate through the tiers configured for the analyzer.
+    Returns the Issue, or None when the candidate is not an issue
+    """
+    config = CASCADE_CONFIG[analyzer]
+    CASCADE_STATS.candidate(analyzer)
+
+    # Tier 1: deterministic local check
+    if local_check is not None:
+        start = time.perf_counter()
+        result = local_check(snippet)
+        resolved = result is not None
+        CASCADE_STATS.record(analyzer, 'local', resolved, time.perf_counter() - start)
+
+        if result is DISMISS:
+            return None
+        if resolved:
+            return result
+
+    # Tier 2+: models, cheapest first
+    models: List[str] = config['models']
+    verdict = None
+
+    for index, model in enumerate(models):
+        start = time.perf_counter()
+        verdict = _ask_model(model, analyzer, config['expert'], snippet, line_number, language, context)
+
+        is_last = index == len(models) - 1
+        unsure = verdict.confidence < config['min_confidence']
+        critical = verdict.is_issue and verdict.severity == Severity.CRITICAL and config['escalate_critical']
+        escalate = not is_last and (unsure or critical)
+
+        CASCADE_STATS.record(analyzer, model, not escalate, time.perf_counter() - start)
+
+        if not escalate:
+            break
+
+    if not verdict.is_issue:
+        return None
+
+    return Issue(
+        type = analyzer,
+        severity = verdict.severity,
+        message = verdict.message,
+        line_number = line_number,
+        suggestion = verdict.suggestion
+    )
@@ -0,0 +1,584 @@
+# Local dependency engine used by analyze_dependency_tool
+#
+# Imports are parsed with ast (Python) or the JS tokenizer (JavaScript / TypeScript)
+# and resolved against:
+#   - the standard library index (sys.stdlib_module_names / Node builtins)
+#   - the reviewed project's requirements.txt and package.json, taken from the
+#     submitted files or from the checkout at PROJECT_ROOT
+#   - the project's own top-level modules
+# Without a manifest of the reviewed project nothing is reported as unresolved
+# Unused, duplicate and unresolved imports are found by symbol lookup, so the
+# answers are deterministic and need no LLM. Known deprecated packages come
+# from data/advisories.json
+
+import os
+import re
+import ast
+import sys
+import json
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from importlib import metadata
+from tools.js_tokenizer import tokenize
+
+ADVISORY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'advisories.json')
+
+JS_LANGUAGES = {'javascript', 'typescript', 'jsx', 'tsx', 'react'}
+
+NODE_BUILTINS = frozenset({
+    'assert', 'async_hooks', 'buffer', 'child_process', 'cluster', 'console', 'constants', 'crypto',
+    'dgram', 'diagnostics_channel', 'dns', 'domain', 'events', 'fs', 'http', 'http2', 'https',
+    'inspector', 'module', 'net', 'os', 'path', 'perf_hooks', 'process', 'punycode', 'querystring',
+    'readline', 'repl', 'stream', 'string_decoder', 'sys', 'test', 'timers', 'tls', 'trace_events',
+    'tty', 'url', 'util', 'v8', 'vm', 'wasi', 'worker_threads', 'zlib',
+})
+
+# Distributions whose import name differs from the (normalized) project name
+KNOWN_IMPORT_NAMES = {
+    'python_dotenv': ['dotenv'],
+    'beautifulsoup4': ['bs4'],
+    'pyyaml': ['yaml'],
+    'pillow': ['PIL'],
+    'scikit_learn': ['sklearn'],
+    'opencv_python': ['cv2'],
+    'opencv_python_headless': ['cv2'],
+    'pyjwt': ['jwt'],
+    'psycopg2_binary': ['psycopg2'],
+    'python_dateutil': ['dateutil'],
+    'python_multipart': ['multipart', 'python_multipart'],
+    'pymongo': ['pymongo', 'bson', 'gridfs'],
+    'protobuf': ['google'],
+    'google_cloud_storage': ['google'],
+    'attrs': ['attr', 'attrs'],
+    'pycryptodome': ['Crypto'],
+    'pycrypto': ['Crypto'],
+    'pyopenssl': ['OpenSSL'],
+    'msgpack_python': ['msgpack'],
+    'setuptools': ['setuptools', 'pkg_resources'],
+}
+
+# Modules that are imported for their side effects or are always fine to leave unused
+IMPLICITLY_USED = {'__future__'}
+
+
+@dataclass
+class ImportRecord:
+    module: str  # module path / package specifier as written
+    name: Optional[str]  # local name it binds, None for side-effect imports
+    imported: str  # what was imported ("*" for star imports)
+    line: int
+    relative: bool = False
+    scope: str = ''  # enclosing function / class, '' at module level
+
+
+@dataclass
+class DependencyFinding:
+    kind: str  # 'unused', 'duplicate', 'unresolved', 'advisory'
+    line: int
+    module: str
+    name: Optional[str]
+    message: str
+    suggestion: str
+    severity: str
+    advisory: Optional[dict] = None
+
+
+@dataclass
+class ProjectIndex:
+    root: str
+    python_packages: Set[str] = field(default_factory=set)  # import names declared in requirements.txt
+    python_distributions: Set[str] = field(default_factory=set)  # normalized distribution names in requirements.txt
+    python_manifest: bool = False
+    js_packages: Set[str] = field(default_factory=set)  # names declared in package.json
+    js_manifest: bool = False
+    local_modules: Set[str] = field(default_factory=set)  # top-level modules of the project itself
+
+
+def normalize(name: str) -> str:
+    return re.sub(r'[-_.]+', '_', name).lower()
+
+
+# Python
+
+
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+def _walk_scoped(tree: ast.AST) -> Iterator[Tuple[ast.AST, str]]:
+    """
+    Like ast.walk, with the enclosing function / class of every node
+    """
+    stack = [(tree, '')]
+    while stack:
+        node, scope = stack.pop()
+        yield node, scope
+        if isinstance(node, SCOPE_NODES):
+            scope = f'{scope}/{getattr(node, "name", "lambda")}@{node.lineno}'
+        stack.extend((child, scope) for child in ast.iter_child_nodes(node))
+
+
+def parse_python_imports(code: str) -> Tuple[List[ImportRecord], Set[str]]:
+    """
+    Returns the imports and every name the rest of the code uses
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return _parse_python_imports_fallback(code)
+
+    imports = []
+    used = set()
+
+    for node, scope in _walk_scoped(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                # "import a.b" binds "a", "import a.b as c" binds "c"
+                bound = alias.asname or alias.name.split('.')[0]
+                imports.append(ImportRecord(alias.name, bound, alias.name, node.lineno, scope=scope))
+
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ''
+            for alias in node.names:
+                bound = None if alias.name == '*' else alias.asname or alias.name
+                imports.append(ImportRecord(module, bound, alias.name, node.lineno, relative=node.level > 0, scope=scope))
+
+        elif isinstance(node, ast.Name):
+            used.add(node.id)
+
+        elif isinstance(node, ast.Assign):
+            # names listed in __all__ count as used (re-exports)
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == '__all__' and isinstance(node.value, (ast.List, ast.Tuple)):
+                    used.update(element.value for element in node.value.elts
+                                if isinstance(element, ast.Constant) and isinstance(element.value, str))
+
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # string annotations ("Foo", "Optional[Foo]")
+            if re.fullmatch(r'[A-Za-z_][\w.]*(\[[\w\[\], .|]*\])?', node.value):
+                used.update(re.findall(r'[A-Za-z_]\w*', node.value))
+
+    imports.sort(key=lambda record: record.line)
+    return imports, used
+
+
+def _fallback_scope(statement: str, line: int) -> str:
+    # without a tree the enclosing function is unknown, indented imports never count as duplicates
+    return f'@{line}' if statement[:1] in ' \t' else ''
+
+
+def _parse_python_imports_fallback(code: str) -> Tuple[List[ImportRecord], Set[str]]:
+    """
+    Line based parsing for code that does not compile (snippets, Python 2)
+    """
+    imports = []
+    import_lines = set()
+
+    for match in re.finditer(r'^[ \t]*import[ \t]+([\w., \t]+)$', code, re.MULTILINE):
+        line = code[:match.start()].count('\n') + 1
+        import_lines.add(line)
+        for part in match.group(1).split(','):
+            words = part.split()
+            if not words:
+                continue
+            bound = words[2] if len(words) == 3 and words[1] == 'as' else words[0].split('.')[0]
+            imports.append(ImportRecord(words[0], bound, words[0], line, scope=_fallback_scope(match.group(0), line)))
+
+    for match in re.finditer(r'^[ \t]*from[ \t]+(\.*)([\w.]*)[ \t]+import[ \t]+\(?([\w., \t]+)\)?', code, re.MULTILINE):
+        line = code[:match.start()].count('\n') + 1
+        import_lines.add(line)
+        for part in match.group(3).split(','):
+            words = part.split()
+            if not words:
+                continue
+            bound = None if words[0] == '*' else words[2] if len(words) == 3 and words[1] == 'as' else words[0]
+            imports.append(ImportRecord(match.group(2), bound, words[0], line, relative=bool(match.group(1)),
+                                        scope=_fallback_scope(match.group(0), line)))
+
+    body = '\n'.join(line for number, line in enumerate(code.split('\n'), 1) if number not in import_lines)
+    return imports, set(re.findall(r'\b[A-Za-z_]\w*\b', body))
+
+
+# JavaScript / TypeScript
+
+
+def parse_js_imports(code: str) -> Tuple[List[ImportRecord], Set[str]]:
+    """
+    ES imports, re-exports, require() and dynamic import(), plus every identifier used outside them
+    """
+    tokens = tokenize(code)
+    imports = []
+    used = set()
+    skip = set()  # token indexes that belong to import statements
+    count = len(tokens)
+
+    def value(index: int) -> Optional[str]:
+        return tokens[index].value if index < count else None
+
+    i = 0
+    while i < count:
+        tok = tokens[i]
+        statement_start = i == 0 or value(i - 1) in (';', '}', '{') or tokens[i - 1].line < tok.line
+
+        # import ... from 'x' / import 'x'
+        if tok.kind == 'ident' and tok.value == 'import' and statement_start and value(i + 1) != '(' and value(i + 1) != '.':
+            j = i + 1
+            if value(j) == 'type':
+                j += 1
+            bindings = []  # (local, imported)
+            in_braces = False
+            while j < count and tokens[j].kind != 'string':
+                current = tokens[j]
+                if current.value in ('{', '}'):
+                    in_braces = current.value == '{'
+                elif current.value == '*' and value(j + 1) == 'as':
+                    bindings.append((value(j + 2), '*'))
+                    j += 3
+                    continue
+                elif current.kind == 'ident' and current.value not in ('from', 'type', 'as'):
+                    if value(j + 1) == 'as':
+                        bindings.append((value(j + 2), current.value))
+                        j += 3
+                        continue
+                    bindings.append((current.value, current.value if in_braces else 'default'))
+                j += 1
+            if j < count:
+                module = tokens[j].value
+                if not bindings:
+                    imports.append(ImportRecord(module, None, '', tok.line))
+                for local, imported in bindings:
+                    imports.append(ImportRecord(module, local, imported, tok.line))
+            skip.update(range(i, j + 1))
+            i = j + 1
+            continue
+
+        # export ... from 'x' (re-export, nothing bound locally)
+        if tok.kind == 'ident' and tok.value == 'export' and statement_start:
+            j = i + 1
+            while j < count and j - i < 200 and tokens[j].value not in (';',) and tokens[j].kind != 'string' \
+                    and not (tokens[j].kind == 'ident' and tokens[j].value in ('const', 'let', 'var', 'function', 'class', 'default', 'interface', 'type', 'enum', 'async')):
+                j += 1
+            if j < count and tokens[j].kind == 'string' and value(j - 1) == 'from':
+                imports.append(ImportRecord(tokens[j].value, None, '*', tok.line))
+                skip.update(range(i, j + 1))
+                i = j + 1
+                continue
+
+        # require('x') and import('x')
+        if tok.kind == 'ident' and tok.value in ('require', 'import') and value(i + 1) == '(' \
+                and i + 2 < count and tokens[i + 2].kind == 'string' and value(i + 3) == ')':
+            module = tokens[i + 2].value
+            # const x = require('x') / const { a, b: c } = require('x')
+            if i >= 2 and value(i - 1) == '=' and tokens[i - 2].kind == 'ident' and value(i - 3) in ('const', 'let', 'var'):
+                imports.append(ImportRecord(module, tokens[i - 2].value, 'default', tok.line))
+                skip.add(i - 2)
+            elif i >= 2 and value(i - 1) == '=' and value(i - 2) == '}':
+                k = i - 3
+                names = []
+                while k >= 0 and value(k) != '{':
+                    if tokens[k].kind == 'ident' and value(k + 1) in (',', '}'):
+                        names.append((tokens[k].value, k))
+                    k -= 1
+                for name, index in names:
+                    imports.append(ImportRecord(module, name, name, tok.line))
+                    skip.add(index)
+            else:
+                imports.append(ImportRecord(module, None, '', tok.line))
+            skip.update(range(i, i + 4))
+            i += 4
+            continue
+
+        i += 1
+
+    for index, tok in enumerate(tokens):
+        # property names after "." are not uses of an imported binding
+        if tok.kind == 'ident' and index not in skip and not (index > 0 and tokens[index - 1].value == '.'):
+            used.add(tok.value)
+
+    return imports, used
+
+
+def js_package_name(specifier: str) -> Optional[str]:
+    """
+    'lodash/get' -> 'lodash', '@scope/pkg/x' -> '@scope/pkg', None for local paths
+    """
+    if specifier.startswith(('.', '/', '@/', '~/', '#')):
+        return None
+    parts = specifier.split('/')
+    if specifier.startswith('@'):
+        return '/'.join(parts[:2])
+    return parts[0]
+
+
+# Project index
+
+
+def _manifest_paths(root: str, name: str) -> List[str]:
+    """
+    Manifest in the root and in its direct subdirectories (backend/, frontend/, ...)
+    """
+    paths = [os.path.join(root, name)]
+    try:
+        for entry in sorted(os.listdir(root)):
+            if not entry.startswith('.') and entry != 'node_modules':
+                paths.append(os.path.join(root, entry, name))
+    except OSError:
+        pass
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def _manifest_signature(root: str) -> tuple:
+    paths = _manifest_paths(root, 'requirements.txt') + _manifest_paths(root, 'package.json')
+    return tuple((path, os.path.getmtime(path)) for path in paths)
+
+
+def _parse_requirements(text: str) -> Set[str]:
+    names = set()
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line or line.startswith('-'):
+            continue
+        match = re.match(r'[A-Za-z0-9][A-Za-z0-9._-]*', line)
+        if match:
+            names.add(normalize(match.group(0)))
+    return names
+
+
+def _parse_package_json(text: str) -> Optional[Set[str]]:
+    """
+    Declared package names, None when the manifest is not valid JSON
+    """
+    try:
+        manifest = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(manifest, dict):
+        return None
+    packages = set()
+    for section in ('dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies'):
+        packages.update(manifest.get(section) or {})
+    return packages
+
+
+def _python_import_names(distributions: Set[str]) -> Set[str]:
+    """
+    Import names provided by the declared distributions
+    """
+    names = set()
+    for dist in distributions:
+        names.add(dist)
+        names.update(KNOWN_IMPORT_NAMES.get(dist, []))
+
+    # installed metadata knows the real top-level packages of every distribution
+    for import_name, dists in _installed_packages().items():
+        if dists & distributions:
+            names.add(import_name)
+
+    return names
+
+
+@lru_cache(maxsize=1)
+def _installed_packages() -> Dict[str, frozenset]:
+    """
+    Import name -> normalized distributions providing it, scanning the metadata is slow so it is done once
+    """
+    try:
+        return {import_name: frozenset(normalize(dist) for dist in dists)
+                for import_name, dists in metadata.packages_distributions().items()}
+    except Exception:
+        return {}
+
+
+def _local_modules(root: str) -> Set[str]:
+    modules = set()
+    try:
+        subdirectories = [os.path.join(root, entry) for entry in os.listdir(root)
+                          if os.path.isdir(os.path.join(root, entry)) and not entry.startswith('.')]
+    except OSError:
+        return modules
+
+    for directory in [root] + subdirectories:
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.endswith('.py'):
+                modules.add(entry[:-3])
+            elif os.path.isfile(os.path.join(directory, entry, '__init__.py')):
+                modules.add(entry)
+    return modules
+
+
+@lru_cache(maxsize=8)
+def _build_project_index(root: str, signature: tuple) -> ProjectIndex:
+    index = ProjectIndex(root=root)
+
+    distributions = set()
+    for path in _manifest_paths(root, 'requirements.txt'):
+        try:
+            with open(path) as f:
+                distributions |= _parse_requirements(f.read())
+        except OSError:
+            continue
+        index.python_manifest = True
+    index.python_distributions = distributions
+    index.python_packages = _python_import_names(distributions)
+
+    for path in _manifest_paths(root, 'package.json'):
+        try:
+            with open(path) as f:
+                packages = _parse_package_json(f.read())
+        except OSError:
+            continue
+        if packages is not None:
+            index.js_manifest = True
+            index.js_packages |= packages
+
+    index.local_modules = _local_modules(root)
+    return index
+
+
+def get_project_index(root: Optional[str] = None) -> Optional[ProjectIndex]:
+    """
+    Index of the checkout at PROJECT_ROOT, rebuilt when a manifest changes.
+    None when no project is configured, the service's own directory is never used
+    """
+    root = root or os.getenv('PROJECT_ROOT')
+    if not root:
+        return None
+    root = os.path.abspath(root)
+    try:
+        signature = _manifest_signature(root)
+    except OSError:
+        return None
+    return _build_project_index(root, signature)
+
+
+def project_index_from_files(files: Dict[str, str]) -> Optional[ProjectIndex]:
+    """
+    Index of the submitted project files (path -> source), None when they hold no manifest
+    """
+    index = ProjectIndex(root='<submitted>')
+
+    distributions = set()
+    for path, source in files.items():
+        parts = path.replace('\\', '/').strip('/').split('/')
+        name = parts[-1]
+
+        if name == 'requirements.txt':
+            distributions |= _parse_requirements(source)
+            index.python_manifest = True
+        elif name == 'package.json' and 'node_modules' not in parts:
+            packages = _parse_package_json(source)
+            if packages is not None:
+                index.js_manifest = True
+                index.js_packages |= packages
+        elif name.endswith('.py'):
+            # every directory on the path can be a package root
+            index.local_modules.update(part for part in parts[:-1] if part.isidentifier())
+            index.local_modules.add(name[:-3])
+
+    if not (index.python_manifest or index.js_manifest):
+        return None
+
+    index.python_distributions = distributions
+    index.python_packages = _python_import_names(distributions)
+    return index
+
+
+@lru_cache(maxsize=1)
+def load_advisories() -> dict:
+    try:
+        with open(ADVISORY_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Analysis
+
+
+def analyze_imports(code: str, language: str, project: Optional[ProjectIndex] = None,
+                    files: Optional[Dict[str, str]] = None) -> List[DependencyFinding]:
+    """
+    Unused, duplicate, unresolved and advisory findings for one file, sorted by line.
+    Imports are resolved against `project`, else the manifests among the submitted `files`,
+    else PROJECT_ROOT. Without any of them the unresolved check is skipped
+    """
+    language = language.lower()
+    if language == 'python':
+        imports, used = parse_python_imports(code)
+        ecosystem = 'python'
+    elif language in JS_LANGUAGES:
+        imports, used = parse_js_imports(code)
+        ecosystem = 'javascript'
+    else:
+        return []
+
+    project = project or project_index_from_files(files or {}) or get_project_index() or ProjectIndex(root='')
+    advisories = load_advisories().get(ecosystem, {})
+    findings = []
+    seen: Dict[tuple, int] = {}
+    checked_modules = set()
+
+    for record in imports:
+        # Duplicates: the same thing bound to the same name twice
+        key = (record.scope, record.module, record.imported, record.name)
+        if key in seen:
+            findings.append(DependencyFinding(
+                'duplicate', record.line, record.module, record.name,
+                f'Duplicate import of {record.imported or record.module} from {record.module} (first imported on line {seen[key]})',
+                'Remove the duplicate import', 'low'
+            ))
+            continue
+        seen[key] = record.line
+
+        # Unused: the bound name never appears in the rest of the code
+        if record.name and record.name not in used and record.module not in IMPLICITLY_USED and not record.name.startswith('_'):
+            findings.append(DependencyFinding(
+                'unused', record.line, record.module, record.name,
+                f'Unused import {record.name}' + (f' from {record.module}' if record.module and record.module != record.name else ''),
+                f'Remove the import of {record.name}', 'low'
+            ))
+
+        if record.module in checked_modules or record.relative:
+            continue
+        checked_modules.add(record.module)
+
+        if ecosystem == 'python':
+            top_level = record.module.split('.')[0]
+            advisory = advisories.get(top_level) or advisories.get(record.module)
+            # some import names are shared, e.g. Crypto by pycrypto and pycryptodome
+            if advisory and project.python_distributions & {normalize(dist) for dist in advisory.get('unless_declared', [])}:
+                advisory = None
+            resolved = top_level in sys.stdlib_module_names or top_level in project.python_packages \
+                or top_level in project.local_modules or not project.python_manifest
+            manifest = 'requirements.txt'
+        else:
+            package = js_package_name(record.module)
+            if package is None:
+                continue
+            bare = package[5:] if package.startswith('node:') else package
+            advisory = advisories.get(record.module) or advisories.get(package)
+            resolved = bare in NODE_BUILTINS or package in project.js_packages or not project.js_manifest
+            top_level = package
+            manifest = 'package.json'
+
+        # Advisory: known deprecated or removed packages (takes precedence over unresolved)
+        if advisory:
+            findings.append(DependencyFinding(
+                'advisory', record.line, top_level, record.name,
+                f'{advisory["message"]}',
+                f'Replace it with {advisory["replacement"]}', advisory.get('severity', 'medium'),
+                advisory=advisory
+            ))
+        elif not resolved:
+            findings.append(DependencyFinding(
+                'unresolved', record.line, top_level, record.name,
+                f'{top_level} is not in the standard library, the project or {manifest}',
+                f'Add {top_level} to {manifest} or fix the import', 'medium'
+            ))
+
+    findings.sort(key=lambda finding: finding.line)
+    return findings
@@ -0,0 +1,167 @@
+# Small JavaScript / TypeScript tokenizer
+#
+# Good enough to find imports, requires and identifiers: comments are dropped,
+# strings and template literals become single tokens (code inside ${...} is
+# still tokenized), regex literals are told apart from division by the
+# previous token. It is not a parser
+
+from dataclasses import dataclass
+from typing import Iterator, List
+
+IDENT_START = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$')
+IDENT_CHARS = IDENT_START | set('0123456789')
+
+# after these a "/" starts a regex literal, not a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^') | {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await'}
+
+
+@dataclass
+class Token:
+    kind: str  # 'ident', 'string', 'template', 'number', 'punct', 'regex'
+    value: str
+    line: int
+
+
+def tokenize(code: str) -> List[Token]:
+    return list(iter_tokens(code))
+
+
+def iter_tokens(code: str) -> Iterator[Token]:
+    i = 0
+    line = 1
+    length = len(code)
+    previous = None  # last significant token, decides regex vs division
+    braces: List[str] = []  # '{' for blocks, '${' for template substitutions
+
+    def token(kind: str, value: str, at_line: int) -> Token:
+        nonlocal previous
+        previous = Token(kind, value, at_line)
+        return previous
+
+    def read_template(start: int):
+        """
+        Reads template text from `start` (after ` or }) up to the closing ` or the next ${
+        """
+        nonlocal line
+        j = start
+        while j < length:
+            char = code[j]
+            if char == '\\':
+                j += 2
+                continue
+            if char == '\n':
+                line += 1
+            if char == '`':
+                return j + 1, False
+            if char == '$' and j + 1 < length and code[j + 1] == '{':
+                return j + 2, True
+            j += 1
+        return length, False
+
+    while i < length:
+        char = code[i]
+
+        # whitespace
+        if char == '\n':
+            line += 1
+            i += 1
+            continue
+        if char in ' \t\r\f\v':
+            i += 1
+            continue
+
+        # comments
+        if code.startswith('//', i):
+            end = code.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        if code.startswith('/*', i):
+            end = code.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            line += code.count('\n', i, end)
+            i = end
+            continue
+
+        # identifiers and keywords
+        if char in IDENT_START:
+            j = i + 1
+            while j < length and code[j] in IDENT_CHARS:
+                j += 1
+            yield token('ident', code[i:j], line)
+            i = j
+            continue
+
+        # numbers
+        if char.isdigit():
+            j = i + 1
+            while j < length and (code[j] in IDENT_CHARS or code[j] == '.'):
+                j += 1
+            yield token('number', code[i:j], line)
+            i = j
+            continue
+
+        # strings
+        if char in '"\'':
+            j = i + 1
+            while j < length and code[j] != char and code[j] != '\n':
+                j += 2 if code[j] == '\\' else 1
+            yield token('string', code[i + 1:j], line)
+            i = j + 1
+            continue
+
+        # template literals, ${...} contents are tokenized as code
+        if char == '`':
+            start_line = line
+            end, substitution = read_template(i + 1)
+            yield token('template', code[i + 1:end - (2 if substitution else 1)], start_line)
+            if substitution:
+                braces.append('${')
+            i = end
+            continue
+
+        if char == '{':
+            braces.append('{')
+            yield token('punct', char, line)
+            i += 1
+            continue
+
+        if char == '}':
+            if braces and braces.pop() == '${':
+                # back inside the template literal
+                end, substitution = read_template(i + 1)
+                if substitution:
+                    braces.append('${')
+                previous = Token('template', '', line)
+                i = end
+                continue
+            yield token('punct', char, line)
+            i += 1
+            continue
+
+        # regex literal or division
+        if char == '/':
+            is_regex = previous is None or (previous.kind == 'punct' and previous.value in REGEX_PRECEDERS) \
+                or (previous.kind == 'ident' and previous.value in REGEX_PRECEDERS)
+            if is_regex:
+                j = i + 1
+                in_class = False
+                while j < length and code[j] != '\n':
+                    if code[j] == '\\':
+                        j += 2
+                        continue
+                    if code[j] == '[':
+                        in_class = True
+                    elif code[j] == ']':
+                        in_class = False
+                    elif code[j] == '/' and not in_class:
+                        break
+                    j += 1
+                j += 1
+                while j < length and code[j] in IDENT_CHARS:
+                    j += 1
+                yield token('regex', code[i:j], line)
+                i = j
+                continue
+
+        yield token('punct', char, line)
+        i += 1
@@ -0,0 +1,358 @@
+# Local secret scanner used by analyze_security_tool
+#
+# 1. An Aho-Corasick automaton finds every literal prefix ("akia", "ghp_", "sk-", ...)
+#    in a single pass over the code, so scanning stays linear in input size
+# 2. Only the lines that contain a literal are checked with the provider regexes
+# 3. Shannon entropy separates real credentials from placeholders and finds
+#    generic high-entropy strings that no provider rule knows about
+#
+# Known provider formats are scored locally, only ambiguous hits need the LLM
+
+import re
+import math
+from bisect import bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class SecretRule:
+    id: str
+    description: str
+    keywords: Tuple[str, ...]  # lowercase literals for the prefilter
+    pattern: str
+    severity: str = 'critical'
+    generic: bool = False  # generic rules are checked with entropy, not trusted as-is
+
+
+@dataclass
+class SecretFinding:
+    rule_id: str
+    description: str
+    line_number: int
+    secret: str
+    severity: str
+    entropy: float
+    ambiguous: bool  # True when the LLM should decide
+
+    @property
+    def redacted(self) -> str:
+        return redact(self.secret)
+
+
+# Catalogue of provider key formats, more specific rules first (first match wins on a span)
+# Variable-length parts are bounded so a long line cannot make a rule backtrack quadratically
+RULES: List[SecretRule] = [
+    # Private keys
+    SecretRule('private-key', 'Private key block', ('-----begin',),
+               r'-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----'),
+    SecretRule('age-secret-key', 'age encryption secret key', ('age-secret-key-1',),
+               r'AGE-SECRET-KEY-1[QPZRY9X8GF2TVDW0S3JN54KHCE6MUA7L]{58}'),
+
+    # Cloud providers
+    SecretRule('aws-access-key-id', 'AWS access key ID', ('akia', 'asia', 'abia', 'acca'),
+               r'\b(?:AKIA|ASIA|ABIA|ACCA)[0-9A-Z]{16}\b'),
+    SecretRule('aws-secret-access-key', 'AWS secret access key', ('aws_secret', 'aws-secret', 'awssecret'),
+               r'(?i)aws[_-]?secret[_-]?(?:access[_-]?)?key\s*[:=]\s*["\']?([A-Za-z0-9/+=]{40})\b'),
+    SecretRule('gcp-api-key', 'Google API key', ('aiza',),
+               r'\bAIza[0-9A-Za-z_\-]{35}\b'),
+    SecretRule('gcp-oauth-secret', 'Google OAuth client secret', ('gocspx-',),
+               r'\bGOCSPX-[A-Za-z0-9_\-]{28}\b'),
+    SecretRule('gcp-service-account', 'Google service account private key', ('"private_key_id"',),
+               r'"private_key_id"\s*:\s*"[a-f0-9]{40}"'),
+    SecretRule('azure-storage-key', 'Azure storage account key', ('accountkey=',),
+               r'AccountKey=[A-Za-z0-9+/=]{88}'),
+    SecretRule('alibaba-access-key', 'Alibaba Cloud access key ID', ('ltai',),
+               r'\bLTAI[A-Za-z0-9]{20}\b'),
+    SecretRule('digitalocean-token', 'DigitalOcean token', ('dop_v1_', 'doo_v1_', 'dor_v1_'),
+               r'\bdo[opr]_v1_[a-f0-9]{64}\b'),
+    SecretRule('heroku-api-key', 'Heroku API key', ('heroku',),
+               r'(?i)heroku[\w.-]{0,40}\s*[:=]\s*["\']?[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'),
+
+    # AI providers
+    SecretRule('anthropic-api-key', 'Anthropic API key', ('sk-ant-',),
+               r'\bsk-ant-(?:api03|admin01)-[A-Za-z0-9_\-]{80,}'),
+    SecretRule('openai-api-key', 'OpenAI API key', ('sk-',),
+               r'\bsk-(?:proj-|svcacct-|admin-)?[A-Za-z0-9_\-]{32,}'),
+    SecretRule('huggingface-token', 'Hugging Face access token', ('hf_',),
+               r'\bhf_[A-Za-z]{34}\b'),
+
+    # Source control and package registries
+    SecretRule('github-pat', 'GitHub personal access token', ('ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_'),
+               r'\bgh[pousr]_[A-Za-z0-9]{36}\b'),
+    SecretRule('github-fine-grained-pat', 'GitHub fine-grained access token', ('github_pat_',),
+               r'\bgithub_pat_[A-Za-z0-9_]{82}\b'),
+    SecretRule('gitlab-pat', 'GitLab personal access token', ('glpat-',),
+               r'\bglpat-[A-Za-z0-9_\-]{20}\b'),
+    SecretRule('npm-token', 'npm access token', ('npm_',),
+               r'\bnpm_[A-Za-z0-9]{36}\b'),
+    SecretRule('pypi-token', 'PyPI upload token', ('pypi-ageichlwas5vcmc',),
+               r'\bpypi-AgEIcHlwaS5vcmc[A-Za-z0-9_\-]{50,}'),
+
+    # Payments
+    SecretRule('stripe-live-key', 'Stripe live secret key', ('sk_live_', 'rk_live_'),
+               r'\b[rs]k_live_[0-9a-zA-Z]{24,}\b'),
+    SecretRule('stripe-test-key', 'Stripe test secret key', ('sk_test_', 'rk_test_'),
+               r'\b[rs]k_test_[0-9a-zA-Z]{24,}\b', severity='medium'),
+    SecretRule('square-access-token', 'Square access token', ('sq0atp-', 'eaaa'),
+               r'\b(?:sq0atp-[0-9A-Za-z_\-]{22}|EAAA[0-9A-Za-z_\-]{60})\b'),
+    SecretRule('square-oauth-secret', 'Square OAuth secret', ('sq0csp-',),
+               r'\bsq0csp-[0-9A-Za-z_\-]{43}\b'),
+    SecretRule('shopify-token', 'Shopify access token', ('shpat_', 'shpss_', 'shpca_', 'shppa_'),
+               r'\bshp(?:at|ss|ca|pa)_[a-fA-F0-9]{32}\b'),
+
+    # Messaging and email
+    SecretRule('slack-token', 'Slack token', ('xoxb-', 'xoxa-', 'xoxp-', 'xoxr-', 'xoxs-', 'xoxe-'),
+               r'\bxox[abeprs]-[0-9A-Za-z\-]{10,}'),
+    SecretRule('slack-webhook', 'Slack incoming webhook', ('hooks.slack.com',),
+               r'https://hooks\.slack\.com/services/T[A-Z0-9]+/B[A-Z0-9]+/[A-Za-z0-9]+'),
+    SecretRule('discord-webhook', 'Discord webhook', ('discord.com/api/webhooks', 'discordapp.com/api/webhooks'),
+               r'https://discord(?:app)?\.com/api/webhooks/\d+/[\w\-]+'),
+    SecretRule('telegram-bot-token', 'Telegram bot token', (':aa',),
+               r'\b\d{8,10}:AA[0-9A-Za-z_\-]{33}\b'),
+    SecretRule('twilio-api-key', 'Twilio API key', ('twilio',),
+               r'(?i)twilio[\w.-]{0,40}\s*[:=]\s*["\']?SK[0-9a-fA-F]{32}'),
+    SecretRule('sendgrid-api-key', 'SendGrid API key', ('sg.',),
+               r'\bSG\.[A-Za-z0-9_\-]{22}\.[A-Za-z0-9_\-]{43}\b'),
+    SecretRule('mailgun-api-key', 'Mailgun API key', ('key-',),
+               r'\bkey-[0-9a-zA-Z]{32}\b'),
+    SecretRule('mailchimp-api-key', 'Mailchimp API key', ('-us',),
+               r'\b[0-9a-f]{32}-us[0-9]{1,2}\b'),
+    SecretRule('facebook-access-token', 'Facebook access token', ('eaacedeose0cba',),
+               r'\bEAACEdEose0cBA[0-9A-Za-z]+'),
+
+    # Infrastructure and SaaS
+    SecretRule('vault-token', 'HashiCorp Vault token', ('hvs.', 'hvb.'),
+               r'\bhv[sb]\.[A-Za-z0-9_\-]{90,}'),
+    SecretRule('terraform-cloud-token', 'Terraform Cloud token', ('.atlasv1.',),
+               r'\b[A-Za-z0-9]{14}\.atlasv1\.[A-Za-z0-9_\-=]{60,}'),
+    SecretRule('pulumi-token', 'Pulumi access token', ('pul-',),
+               r'\bpul-[a-f0-9]{40}\b'),
+    SecretRule('supabase-token', 'Supabase access token', ('sbp_',),
+               r'\bsbp_[a-f0-9]{40}\b'),
+    SecretRule('databricks-token', 'Databricks access token', ('dapi',),
+               r'\bdapi[a-f0-9]{32}\b'),
+    SecretRule('atlassian-token', 'Atlassian API token', ('atatt3',),
+               r'\bATATT3[A-Za-z0-9_\-=]{180,}'),
+    SecretRule('linear-api-key', 'Linear API key', ('lin_api_',),
+               r'\blin_api_[A-Za-z0-9]{40}\b'),
+    SecretRule('doppler-token', 'Doppler token', ('dp.pt.', 'dp.st.', 'dp.sa.'),
+               r'\bdp\.(?:pt|st|sa)\.[A-Za-z0-9]{40,}'),
+    SecretRule('postman-api-key', 'Postman API key', ('pmak-',),
+               r'\bPMAK-[a-f0-9]{24}-[a-f0-9]{34}\b'),
+    SecretRule('newrelic-api-key', 'New Relic user API key', ('nrak-',),
+               r'\bNRAK-[A-Z0-9]{27}\b'),
+    SecretRule('grafana-token', 'Grafana token', ('glc_', 'glsa_'),
+               r'\b(?:glc_[A-Za-z0-9+/]{32,}={0,2}|glsa_[A-Za-z0-9]{32}_[A-Fa-f0-9]{8})'),
+    SecretRule('jwt', 'JSON Web Token', ('eyj',),
+               r'\beyJ[A-Za-z0-9_\-]{10,}\.eyJ[A-Za-z0-9_\-]{10,}\.[A-Za-z0-9_\-]{10,}', severity='high'),
+
+    # Connection strings with inline credentials
+    SecretRule('connection-string', 'Connection string with embedded password',
+               ('postgres://', 'postgresql://', 'mysql://', 'mongodb://', 'mongodb+srv://', 'redis://', 'amqp://', 'mssql://'),
+               r'\b(?:postgres(?:ql)?|mysql|mongodb(?:\+srv)?|redis|amqp|mssql)://[^\s:/@"\']{1,256}:([^\s@"\']{1,256})@', severity='high'),
+
+    # Generic key = "value" assignments, the key must contain GENERIC_KEY and the value
+    # is checked with entropy before it is trusted. The key is matched from the start
+    # of the identifier only and checked in Python, which keeps the regex linear
+    SecretRule('generic-assignment', 'Hardcoded credential',
+               ('password', 'passwd', 'pwd', 'secret', 'token', 'api_key', 'apikey', 'api-key',
+                'access_key', 'credential', 'private_key'),
+               r'(?<![\w.\-])([\w.\-]+)["\']?\s*[:=]\s*["\']([^"\'\s]{4,})["\']',
+               severity='high', generic=True),
+]
+
+# Keys of generic assignments that hold credentials
+GENERIC_KEY = re.compile(r'(?i)password|passwd|pwd|secret|token|api[_\-]?key|access[_\-]?key|credential|private[_\-]?key')
+
+# Quoted strings that may be secrets even without a keyword around them
+GENERIC_STRING = re.compile(r'["\']([A-Za-z0-9+/=_\-]{20,})["\']')
+
+# Values that are obviously not real credentials
+PLACEHOLDER = re.compile(
+    r'(?i)^(?:\$\{.*\}|\{\{.*\}\}|<.*>|%\(.*\)s|x+|\*+|\.+)$|changeme|change_me|example|dummy|placeholder|your[_\-]|redacted|sample|fake|todo'
+)
+
+# Shannon entropy thresholds (bits per character)
+HEX_ENTROPY_THRESHOLD = 3.0
+BASE64_ENTROPY_THRESHOLD = 4.0
+ASSIGNMENT_ENTROPY_THRESHOLD = 3.5
+HEX_CHARS = set('0123456789abcdefABCDEF')
+
+
+def shannon_entropy(value: str) -> float:
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum(count / length * math.log2(count / length) for count in Counter(value).values())
+
+
+def redact(secret: str) -> str:
+    """
+    Keep a short prefix so the finding is recognisable without leaking the secret
+    """
+    if len(secret) <= 8:
+        return '*' * len(secret)
+    return secret[:4] + '*' * (len(secret) - 4)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton, finds all literals in one pass over the text
+    """
+
+    def __init__(self, keywords):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._build()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append(keyword)
+
+    def _build(self):
+        # breadth first, every state falls back to its longest proper suffix
+        # (depth 1 states keep the root as fallback)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (start_index, keyword) for every occurrence
+        """
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for keyword in self.output[state]:
+                yield index - len(keyword) + 1, keyword
+
+
+# Built once at import, keyword -> rules that use it
+_RULES_BY_KEYWORD: Dict[str, List[int]] = {}
+for _index, _rule in enumerate(RULES):
+    for _keyword in _rule.keywords:
+        _RULES_BY_KEYWORD.setdefault(_keyword, []).append(_index)
+
+_MATCHER = KeywordMatcher(_RULES_BY_KEYWORD.keys())
+
+# Keywords are ASCII, lowering only A-Z keeps every offset in place
+# (str.lower() can grow a character, e.g. 'İ' becomes two)
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+_COMPILED = [re.compile(rule.pattern) for rule in RULES]
+
+
+def _is_placeholder(value: str) -> bool:
+    return bool(PLACEHOLDER.search(value))
+
+
+def _high_entropy(value: str) -> Optional[float]:
+    """
+    Entropy of the value if it is high enough for its character set, else None
+    """
+    entropy = shannon_entropy(value)
+    if set(value) <= HEX_CHARS:
+        return entropy if len(value) >= 32 and entropy >= HEX_ENTROPY_THRESHOLD else None
+    return entropy if entropy >= BASE64_ENTROPY_THRESHOLD else None
+
+
+def scan_secrets(code: str) -> List[SecretFinding]:
+    """
+    Scan code for secrets, returns findings sorted by line number
+    """
+    line_starts = [0] + [match.end() for match in re.finditer('\n', code)]
+    lines = code.split('\n')
+
+    # 1. prefilter, which rules need to run on which lines
+    candidates: Dict[int, set] = {}
+    for start, keyword in _MATCHER.iter_matches(code.translate(_ASCII_LOWER)):
+        line_index = bisect_right(line_starts, start) - 1
+        candidates.setdefault(line_index, set()).update(_RULES_BY_KEYWORD[keyword])
+
+    findings: List[SecretFinding] = []
+    seen_spans: Dict[int, List[Tuple[int, int]]] = {}
+
+    def overlaps(line_index: int, span: Tuple[int, int]) -> bool:
+        return any(span[0] < end and start < span[1] for start, end in seen_spans.get(line_index, []))
+
+    # 2. provider rules, only on the lines the prefilter picked
+    for line_index in sorted(candidates):
+        line = lines[line_index]
+        for rule_index in sorted(candidates[line_index]):
+            rule = RULES[rule_index]
+            for match in _COMPILED[rule_index].finditer(line):
+                span = match.span()
+                if overlaps(line_index, span):
+                    continue
+
+                if rule.generic:
+                    key, secret = match.group(1), match.group(2)
+                    if not GENERIC_KEY.search(key) or _is_placeholder(secret):
+                        continue
+                    entropy = shannon_entropy(secret)
+                    # long random values are real credentials, short or readable ones need a second opinion
+                    ambiguous = len(secret) < 12 or entropy < ASSIGNMENT_ENTROPY_THRESHOLD
+                else:
+                    secret = match.group(1) if match.groups() else match.group(0)
+                    entropy = shannon_entropy(secret)
+                    ambiguous = False
+
+                seen_spans.setdefault(line_index, []).append(span)
+                findings.append(SecretFinding(
+                    rule_id=rule.id,
+                    description=rule.description,
+                    line_number=line_index + 1,
+                    secret=secret,
+                    severity=rule.severity,
+                    entropy=round(entropy, 2),
+                    ambiguous=ambiguous,
+                ))
+
+    # 3. generic high-entropy strings that no rule claimed
+    for match in GENERIC_STRING.finditer(code):
+        line_index = bisect_right(line_starts, match.start()) - 1
+        line_start = line_starts[line_index]
+        span = (match.start() - line_start, match.end() - line_start)
+        value = match.group(1)
+
+        if overlaps(line_index, span) or _is_placeholder(value):
+            continue
+
+        entropy = _high_entropy(value)
+        if entropy is None:
+            continue
+
+        seen_spans.setdefault(line_index, []).append(span)
+        findings.append(SecretFinding(
+            rule_id='high-entropy-string',
+            description='High-entropy string',
+            line_number=line_index + 1,
+            secret=value,
+            severity='medium',
+            entropy=round(entropy, 2),
+            ambiguous=True,
+        ))
+
+    findings.sort(key=lambda finding: finding.line_number)
+    return findings
@@ -0,0 +1,436 @@
+# Symbol index used by analyze_test_coverage_tool
+#
+# Maps every function and class definition to the test files and test functions
+# that reference it, across a submitted set of files and/or a local checkout
+# (SYMBOL_INDEX_ROOT). Files are parsed once per content hash, so updating the
+# index after a change only re-parses the files that actually changed
+
+import os
+import re
+import ast
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from tools.js_tokenizer import tokenize
+
+PYTHON_EXTENSIONS = ('.py',)
+JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', '.next', 'dist', 'build', '.tox', '.mypy_cache'}
+
+# JS test blocks, the first string argument is the test name
+JS_TEST_CALLS = {'it', 'test'}
+
+# Functions that are entry points rather than units to test
+NOT_TESTED_DIRECTLY = {'main', 'setup', 'teardown'}
+
+PARSE_CACHE_SIZE = 4096
+
+# Seconds between background refreshes of the SYMBOL_INDEX_ROOT checkout
+REFRESH_INTERVAL = float(os.getenv('SYMBOL_INDEX_REFRESH_SECONDS', '30'))
+
+
+@dataclass
+class Definition:
+    name: str  # "func", "Class" or "Class.method"
+    kind: str  # 'function', 'class', 'method'
+    line: int
+    public: bool
+
+    @property
+    def lookup_name(self) -> str:
+        # tests call methods as obj.method(), so methods are matched by their bare name
+        return self.name.rsplit('.', 1)[-1]
+
+
+@dataclass
+class ParsedFile:
+    definitions: List[Definition] = field(default_factory=list)
+    tests: Dict[str, Set[str]] = field(default_factory=dict)  # test name -> names it references
+
+
+@dataclass
+class FileEntry:
+    path: str
+    hash: str
+    is_test: bool
+    parsed: ParsedFile
+    mtime: Optional[float] = None
+    size: Optional[int] = None
+
+
+def hash_source(source: str) -> str:
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def is_test_path(path: str) -> bool:
+    normalized = path.replace('\\', '/')
+    name = normalized.rsplit('/', 1)[-1]
+    parts = normalized.split('/')[:-1]
+
+    if name.endswith(PYTHON_EXTENSIONS):
+        return name.startswith('test_') or name.endswith('_test.py') or name == 'conftest.py' \
+            or 'tests' in parts or 'test' in parts
+    if name.endswith(JS_EXTENSIONS):
+        return '.test.' in name or '.spec.' in name or '__tests__' in parts
+    return False
+
+
+def language_of(path: str) -> Optional[str]:
+    if path.endswith(PYTHON_EXTENSIONS):
+        return 'python'
+    if path.endswith(JS_EXTENSIONS):
+        return 'javascript'
+    return None
+
+
+# Python
+
+
+def _public(name: str) -> bool:
+    return not name.startswith('_')
+
+
+def _references(node: ast.AST) -> Set[str]:
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            names.add(child.attr)
+        elif isinstance(child, ast.alias):
+            names.add((child.asname or child.name).split('.')[-1])
+            names.add(child.name.split('.')[-1])
+    return names
+
+
+def parse_python(source: str, is_test: bool) -> ParsedFile:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError, RecursionError):
+        return _parse_python_fallback(source, is_test)
+
+    parsed = ParsedFile()
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            parsed.definitions.append(Definition(node.name, 'function', node.lineno, _public(node.name)))
+            if is_test and node.name.startswith('test'):
+                parsed.tests[node.name] = _references(node)
+
+        elif isinstance(node, ast.ClassDef):
+            parsed.definitions.append(Definition(node.name, 'class', node.lineno, _public(node.name)))
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    public = _public(node.name) and _public(item.name)
+                    parsed.definitions.append(Definition(f'{node.name}.{item.name}', 'method', item.lineno, public))
+                    if is_test and item.name.startswith('test'):
+                        parsed.tests[f'{node.name}.{item.name}'] = _references(item)
+
+    if is_test:
+        # module level code of a test file (fixtures, imports) counts for every test in it
+        module_refs = _references(ast.Module(body=[node for node in tree.body
+                                                   if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))],
+                                             type_ignores=[]))
+        if module_refs and parsed.tests:
+            for refs in parsed.tests.values():
+                refs |= module_refs
+
+    return parsed
+
+
+def _parse_python_fallback(source: str, is_test: bool) -> ParsedFile:
+    """
+    Regex parsing for files that do not compile, tests get file-level references
+    """
+    parsed = ParsedFile()
+    for match in re.finditer(r'^(?:async[ \t]+)?def[ \t]+(\w+)|^class[ \t]+(\w+)', source, re.MULTILINE):
+        name = match.group(1) or match.group(2)
+        kind = 'function' if match.group(1) else 'class'
+        line = source[:match.start()].count('\n') + 1
+        parsed.definitions.append(Definition(name, kind, line, _public(name)))
+
+    if is_test:
+        refs = set(re.findall(r'\b[A-Za-z_]\w*\b', source))
+        for name in re.findall(r'^[ \t]*(?:async[ \t]+)?def[ \t]+(test\w*)', source, re.MULTILINE):
+            parsed.tests[name] = refs
+
+    return parsed
+
+
+# JavaScript / TypeScript
+
+
+def parse_js(source: str, is_test: bool) -> ParsedFile:
+    tokens = tokenize(source)
+    parsed = ParsedFile()
+    count = len(tokens)
+
+    def value(index: int) -> Optional[str]:
+        return tokens[index].value if 0 <= index < count else None
+
+    def arrow(index: int) -> bool:
+        # the tokenizer emits => as two punct tokens
+        return value(index) == '=' and value(index + 1) == '>'
+
+    depth = 0  # brace depth, only top-level definitions are indexed
+
+    for i, tok in enumerate(tokens):
+        if tok.value == '{':
+            depth += 1
+        elif tok.value == '}':
+            depth = max(0, depth - 1)
+
+        if tok.kind != 'ident' or depth > 0:
+            continue
+
+        # function name(...) / class Name
+        if tok.value in ('function', 'class') and i + 1 < count and tokens[i + 1].kind == 'ident':
+            name = tokens[i + 1].value
+            kind = 'function' if tok.value == 'function' else 'class'
+            parsed.definitions.append(Definition(name, kind, tok.line, _public(name)))
+
+        # const name = (...) => / const name = async (...) => / const name = function
+        elif tok.value in ('const', 'let', 'var') and i + 2 < count and tokens[i + 1].kind == 'ident' and value(i + 2) == '=':
+            j = i + 3
+            if value(j) == 'async':
+                j += 1
+            is_function = value(j) == 'function' or (j < count and tokens[j].kind == 'ident' and arrow(j + 1))
+            if not is_function and value(j) == '(':
+                level = 0
+                while j < count:
+                    if value(j) == '(':
+                        level += 1
+                    elif value(j) == ')':
+                        level -= 1
+                        if level == 0:
+                            break
+                    j += 1
+                is_function = arrow(j + 1) or value(j + 1) == ':'
+            if is_function:
+                name = tokens[i + 1].value
+                parsed.definitions.append(Definition(name, 'function', tok.line, _public(name)))
+
+    if is_test:
+        # it('name', () => { ... }) / test('name', ...), references inside the call
+        for i, tok in enumerate(tokens):
+            if tok.kind == 'ident' and tok.value in JS_TEST_CALLS and value(i + 1) == '(' \
+                    and i + 2 < count and tokens[i + 2].kind in ('string', 'template') and value(i - 1) != '.':
+                refs = set()
+                level = 0
+                j = i + 1
+                while j < count:
+                    if value(j) == '(':
+                        level += 1
+                    elif value(j) == ')':
+                        level -= 1
+                        if level == 0:
+                            break
+                    elif tokens[j].kind == 'ident':
+                        refs.add(tokens[j].value)
+                    j += 1
+                # names repeat across describe blocks, the line keeps every test apart
+                parsed.tests[f'{tokens[i + 2].value or "test"}@{tok.line}'] = refs
+
+    return parsed
+
+
+def parse_file(path: str, source: str) -> ParsedFile:
+    is_test = is_test_path(path)
+    if language_of(path) == 'javascript':
+        return parse_js(source, is_test)
+    return parse_python(source, is_test)
+
+
+class _ParseCache:
+    """
+    Parse results by (content hash, is_test), shared by every index
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, source: str, source_hash: str) -> ParsedFile:
+        key = (source_hash, is_test_path(path), language_of(path))
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        parsed = parse_file(path, source)
+
+        with self._lock:
+            self._items[key] = parsed
+            if len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return parsed
+
+
+PARSE_CACHE = _ParseCache(PARSE_CACHE_SIZE)
+
+
+class SymbolIndex:
+    """
+    Definitions per file and an inverted index: referenced name -> tests that reference it
+    """
+
+    def __init__(self):
+        self.files: Dict[str, FileEntry] = {}
+        self._references: Dict[str, Set[Tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+
+    def update(self, path: str, source: str, mtime: Optional[float] = None, size: Optional[int] = None) -> bool:
+        """
+        Adds or refreshes one file, returns False when its hash did not change
+        """
+        source_hash = hash_source(source)
+
+        with self._lock:
+            current = self.files.get(path)
+            if current is not None and current.hash == source_hash:
+                current.mtime, current.size = mtime, size
+                return False
+
+        parsed = PARSE_CACHE.get(path, source, source_hash)
+
+        with self._lock:
+            self._drop_references(path)
+            entry = FileEntry(path, source_hash, is_test_path(path), parsed, mtime, size)
+            self.files[path] = entry
+            for test_name, refs in parsed.tests.items():
+                for name in refs:
+                    self._references.setdefault(name, set()).add((path, test_name))
+        return True
+
+    def update_many(self, files: Dict[str, str]) -> int:
+        return sum(self.update(path, source) for path, source in files.items())
+
+    def remove(self, path: str):
+        with self._lock:
+            self._drop_references(path)
+            self.files.pop(path, None)
+
+    def _drop_references(self, path: str):
+        current = self.files.get(path)
+        if current is None:
+            return
+        for test_name, refs in current.parsed.tests.items():
+            for name in refs:
+                tests = self._references.get(name)
+                if tests is not None:
+                    tests.discard((path, test_name))
+                    if not tests:
+                        del self._references[name]
+
+    def index_directory(self, root: str) -> int:
+        """
+        Indexes a checkout. Unchanged files (same mtime and size) are not even read,
+        changed files are re-parsed only when their hash differs. Returns the number of re-parsed files
+        """
+        seen = set()
+        changed = 0
+
+        for directory, dirs, names in os.walk(root):
+            dirs[:] = [name for name in dirs if name not in SKIP_DIRS and not name.startswith('.')]
+            for name in names:
+                if language_of(name) is None:
+                    continue
+                full_path = os.path.join(directory, name)
+                path = os.path.relpath(full_path, root)
+                seen.add(path)
+
+                try:
+                    stat = os.stat(full_path)
+                    current = self.files.get(path)
+                    if current is not None and current.mtime == stat.st_mtime and current.size == stat.st_size:
+                        continue
+                    with open(full_path, encoding='utf-8', errors='replace') as f:
+                        source = f.read()
+                except OSError:
+                    continue
+
+                changed += self.update(path, source, stat.st_mtime, stat.st_size)
+
+        for path in list(self.files):
+            if path not in seen:
+                self.remove(path)
+
+        return changed
+
+    def tests_for(self, definition: Definition) -> Set[Tuple[str, str]]:
+        """
+        (test file, test name) pairs that reference the definition
+        """
+        with self._lock:
+            return set(self._references.get(definition.lookup_name, ()))
+
+    def has_tests(self) -> bool:
+        with self._lock:
+            return any(entry.parsed.tests for entry in self.files.values())
+
+
+def untested_definitions(definitions: Iterable[Definition], indexes: List[SymbolIndex]) -> List[Definition]:
+    """
+    Public functions, classes and methods that no test in any of the indexes references.
+    Empty when the indexes hold no tests at all, there is nothing to compare against then
+    """
+    if not any(index.has_tests() for index in indexes):
+        return []
+
+    result = []
+    for definition in definitions:
+        name = definition.lookup_name
+        if not definition.public or name in NOT_TESTED_DIRECTLY or name.startswith('test') \
+                or (name.startswith('__') and name.endswith('__')):
+            continue
+        if not any(index.tests_for(definition) for index in indexes):
+            result.append(definition)
+    return result
+
+
+class _CheckoutRefresher(threading.Thread):
+    """
+    Keeps the checkout index fresh off the request path
+    """
+
+    def __init__(self, root: str):
+        super().__init__(name='symbol-index-refresh', daemon=True)
+        self.root = root
+        self.index = SymbolIndex()
+        self.ready = threading.Event()  # set after the first full pass
+
+    def run(self):
+        while True:
+            try:
+                self.index.index_directory(self.root)
+            except Exception as exc:
+                print(f'Symbol index refresh of {self.root} failed: {exc}')
+            self.ready.set()
+            time.sleep(REFRESH_INTERVAL)
+
+
+_refresher: Optional[_CheckoutRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def get_checkout_index() -> Optional[SymbolIndex]:
+    """
+    Shared index of the checkout at SYMBOL_INDEX_ROOT, refreshed by a background thread
+    every REFRESH_INTERVAL seconds. None when no checkout is configured or the first pass is not done
+    """
+    global _refresher
+    root = os.getenv('SYMBOL_INDEX_ROOT')
+    if not root:
+        return None
+
+    with _refresher_lock:
+        if _refresher is None or _refresher.root != root:
+            _refresher = _CheckoutRefresher(root)
+            _refresher.start()
+        refresher = _refresher
+
+    return refresher.index if refresher.ready.is_set() else None
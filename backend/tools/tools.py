@@ -1,13 +1,71 @@
 import re
-import os
-from typing import List
-from openai import OpenAI
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
 from agent.state import Issue
+from tools.cascade import run_cascade, DISMISS
+from tools.secret_scanner import scan_secrets
+from tools.dependency_index import analyze_imports, JS_LANGUAGES
+from tools.symbol_index import SymbolIndex, get_checkout_index, untested_definitions
+from utils.profiling import span
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Tools to be used as an specific analyzer issues
+# Every tool finds candidates with regex, then each candidate goes through the
+# model cascade (tools/cascade.py): local check -> cheap model -> strong model
+
+
+def find_candidates(patterns: List[str], code: str, flags: int = 0) -> List[Tuple[int, str, str, int]]:
+    """
+    Runs all regex patterns over the code, returns (line_number, snippet, source line, column) tuples.
+    Spans matched by more than one pattern are only returned once
+    """
+    lines = code.split('\n')
+    line_starts = [0] + [match.end() for match in re.finditer('\n', code)]
+    candidates = []
+    seen = set()
+
+    with span('regex scan', 'regex'):
+        for pattern in patterns:
+            for match in re.finditer(pattern, code, flags):
+                if match.span() in seen:
+                    continue
+                seen.add(match.span())
+
+                line_number = bisect_right(line_starts, match.start())
+                column = match.start() - line_starts[line_number - 1]
+                candidates.append((line_number, match.group(0), lines[line_number - 1], column))
+
+    return candidates
+
+
+def local_issue(analyzer: str, severity: str, message: str, suggestion: str):
+    """
+    Builds a local check result, the line number is filled in by run_candidates
+    """
+    return Issue(type=analyzer, severity=severity, message=message, line_number=None, suggestion=suggestion)
+
+
+def run_candidates(analyzer: str, candidates: List[Tuple[int, str, str, int]], language: str, local_check=None) -> List[Issue]:
+    """
+    Sends every candidate through the cascade, local_check gets (snippet, source line, column)
+    """
+    issues = []
+
+    for line_number, snippet, line, column in candidates:
+        check = None
+        if local_check is not None:
+            check = lambda snippet, line=line, column=column: local_check(snippet, line, column)
+
+        issue = run_cascade(analyzer, snippet, line_number, language, local_check=check)
+        if issue is not None:
+            if issue.line_number is None:
+                issue.line_number = line_number
+            issues.append(issue)
+
+    return issues
+
 
 # Tool 1
 # Security tools (Hybrid: regex and LLM)
@@ -15,70 +73,62 @@ def analyze_security_tool(code: str, language: str) -> List[Issue]:
     """
     Analyze code for security vulnerabilities
     """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     issues = []
 
-    # Use regex to find potential secrets
-    secret_patterns = [
-      r'api_key\s*=\s*["\']([^"\']+)["\']',
-      r'password\s*=\s*["\']([^"\']+)["\']',
-      r'token\s*=\s*["\']([^"\']+)["\']',
-      r'sk-[a-zA-Z0-9]{32,}',  # OpenAI API key pattern
-    ]
-
-    for pattern in secret_patterns:
-        
-        #Find pattern using regex
-        matches = re.finditer(pattern, code, re.IGNORECASE)
-        for match in matches:
-
-            # line number
-            line_number = code[:match.start()].count('\n') + 1
-
-            snippet = match.group(0)
-
-            response = client.beta.chat.completions.parse(
-            model='gpt-5-nano',
-            messages=[
-                {'role':'system', 'content': 'You are a security expert'},
-                {'role':'user', 'content': 
-                f"""
-                Analyze this {language} code for security vulnerabilities.   
-                Code: {snippet}                                 
-                Line: {line_number}                             
-                                                                
-                Return JSON with:                               
-                - type: "security"                              
-                - severity: MUST be exactly one of "critical", "high", "medium", or "low"                      
-                - message: description                          
-                - line_number: {line_number}                    
-                - suggestion: how to fix                        
-                                                                
-                Severity guidelines:                            
-                - critical: security vulnerabilities, data loss risks                                           
-                - high: bugs that break functionality           
-                - medium: bad practices, performance issues     
-                - low: style issues, minor improvements         
-                """}
-            ],
-            response_format = Issue, # json format
-            )
-
-            issues.append(response.choices[0].message.parsed)
+    # Local secret scanner (provider key formats + entropy)
+    with span('secret scan', 'regex'):
+        findings = scan_secrets(code)
+    lines = code.split('\n')
+
+    for finding in findings:
+
+        # Known formats are scored locally, no LLM call needed
+        if not finding.ambiguous:
+            issues.append(Issue(
+                type = 'security',
+                severity = finding.severity,
+                message = f'{finding.description} hardcoded on line {finding.line_number} ({finding.redacted})',
+                line_number = finding.line_number,
+                suggestion = 'Remove the secret from the code, rotate it, and load it from an environment variable or a secret manager'
+            ))
+            continue
+
+        # Ambiguous hits (readable values, generic high-entropy strings) go to the cascade
+        line_number = finding.line_number
+
+        # the secret itself is never sent, only the line with the value redacted
+        snippet = lines[line_number - 1].replace(finding.secret, finding.redacted).strip()
+        hint = f'possible {finding.description.lower()}, value length {len(finding.secret)}, entropy {finding.entropy} bits/char'
+
+        issue = run_cascade('security', snippet, line_number, language, context=hint)
+        if issue is not None:
+            issues.append(issue)
     
     return issues
 
 # Tool 2
 # Style tools
+def style_local_check(snippet: str, line: str, column: int):
+    if not snippet.strip():
+        # the run must end the line, an equal run in the middle is alignment
+        if column + len(snippet) == len(line):
+            return local_issue('style', 'low', 'Trailing whitespace', 'Remove the whitespace at the end of the line')
+        # indentation and alignment spaces are not style issues
+        return DISMISS
+    if len(snippet) > 120:
+        return local_issue('style', 'low', f'Line is too long ({len(snippet)} characters)', 'Break the line to stay under 120 characters')
+    if re.match(r'def [a-z]+[A-Z]', snippet):
+        return local_issue('style', 'low', 'Function name uses camelCase', 'Use snake_case for Python function names (PEP 8)')
+    if re.match(r'function [a-z]+_[a-z]+', snippet):
+        return local_issue('style', 'low', 'Function name uses snake_case', 'Use camelCase for JavaScript function names')
+    return None
+
 def analyze_style_tool(code: str, language: str) -> List[Issue]:
     """                                                          
       Analyze code for style issues: naming, line length, spacing, 
       formatting                                                       
     """ 
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    issues = []
-
     special_patterns = [
         # Long lines (>120 chars)                            
         r'^.{121,}$',             
@@ -99,45 +149,103 @@ def analyze_style_tool(code: str, language: str) -> List[Issue]:
         r' +$',  
     ]
 
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code, re.MULTILINE)
-
-        for match in matches:
-
-            line_number = code[:match.start()].count('\n') + 1
-            snippet = match.group(0)
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model = 'gpt-5-nano',
-                messages = [
-                    {'role':'system', 'content': 'You are a style expert, that classifies severity into 3 class: critical, minor, safe'},
-                    {'role':'user', 'content':f'Analyze this {language} code for style issues: \n{snippet}\nLine: {line_number}\nIs this a style violation? If yes, suggest how to fix it.'}
-                ],
-                response_format=Issue
-            )
-
-            issues.append(response.choices[0].message.parsed)
+    # Regex patterns to find candidates
+    candidates = find_candidates(special_patterns, code, re.MULTILINE)
 
+    # Local check, then LLM to validate
     # Return List[Issue]
-    return issues
+    return run_candidates('style', candidates, language, style_local_check)
 
 # Tool 3
 # Complexity tools
+NESTING_INDENT = 16  # 4 levels of 4 spaces
+
+def _scan_line(line: str, depth: int, open_string: Optional[str], language: str) -> Tuple[int, Optional[str]]:
+    """
+    Bracket depth and open multi-line string after the line, comments and strings are skipped
+    """
+    comment = '#' if language == 'python' else '//'
+    # in JS/TS braces open blocks, only () and [] make continuation lines
+    opening, closing = ('([{', ')]}') if language == 'python' else ('([', ')]')
+    i = 0
+
+    while i < len(line):
+        if open_string:
+            if line.startswith(open_string, i):
+                i += len(open_string)
+                open_string = None
+            else:
+                i += 2 if line[i] == '\\' else 1
+            continue
+
+        char = line[i]
+        if line.startswith('"""', i) or line.startswith("'''", i):
+            open_string = line[i:i + 3]
+            i += 3
+        elif char == '`' and language != 'python':
+            open_string = '`'
+            i += 1
+        elif char in '"\'':
+            i += 1
+            while i < len(line) and line[i] != char:
+                i += 2 if line[i] == '\\' else 1
+            i += 1
+        elif line.startswith(comment, i):
+            break
+        else:
+            if char in opening:
+                depth += 1
+            elif char in closing:
+                depth = max(0, depth - 1)
+            i += 1
+
+    return depth, open_string
+
+def deep_nesting_blocks(code: str, language: str) -> List[Tuple[int, int]]:
+    """
+    (first line, last line) of every run of lines indented NESTING_INDENT or more columns.
+    Blank lines, continuation lines and string bodies neither count nor end a run,
+    so a nested block is reported once
+    """
+    blocks = []
+    start = end = None
+    depth = 0
+    open_string = None
+    continued = False  # previous line ended with a backslash
+
+    for number, line in enumerate(code.split('\n'), 1):
+        stripped = line.strip()
+
+        if stripped and not depth and not open_string and not continued:
+            expanded = line.expandtabs(4)
+            if len(expanded) - len(expanded.lstrip()) >= NESTING_INDENT:
+                start = start or number
+                end = number
+            elif start is not None:
+                blocks.append((start, end))
+                start = None
+
+        depth, open_string = _scan_line(line, depth, open_string, language)
+        continued = stripped.endswith('\\')
+
+    if start is not None:
+        blocks.append((start, end))
+    return blocks
+
 def analyze_complexity_tool(code: str, language: str) -> List[Issue]:
     """                                                          
       Analyze code for complexity issues: nesting, long functions, nested loops, long conditionals                             
     """ 
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Deep nesting, one certain issue per nested block (4+ levels of 4 spaces)
     issues = []
+    for start, end in deep_nesting_blocks(code, language):
+        issue = local_issue('complexity', 'medium', f'Code is nested 4 or more levels deep (lines {start}-{end})',
+                            'Use early returns or extract the inner block into a function')
+        issue.line_number = start
+        issues.append(issue)
 
     special_patterns = [
-        # Deep nesting (count leading spaces/tabs)           
-        r'^\s{16,}',  # 4+ levels of indentation (if using 4  spaces)                                              
-                                                            
         # Long functions (find function start, count lines to next function)                                      
         r'^def \w+.*?(?=^def|\Z)',  # Python, use re.MULTILINE | re.DOTALL                                         
         r'^function \w+.*?(?=^function|\Z)',  # JS            
@@ -151,44 +259,26 @@ def analyze_complexity_tool(code: str, language: str) -> List[Issue]:
         r'\|\|.*\|\|.*\|\|',  # Multiple OR conditions
     ]
 
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code, re.MULTILINE | re.DOTALL)
+    # Regex patterns to find candidates
+    candidates = find_candidates(special_patterns, code, re.MULTILINE | re.DOTALL)
 
-        for match in matches:
-            # line number
-            line_number = code[:match.start()].count('\n') + 1
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-            model='gpt-5-nano',
-            messages=[
-                {'role':'system', 'content': 'You are a complexity expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
-            )
-
-            issues.append(response.choices[0].message.parsed)
-    
     # Return List[Issue]
-    return issues
-
-        
-
-        
+    return issues + run_candidates('complexity', candidates, language)
 
 # Tool 4
 # Best practices tool
+def best_practices_local_check(snippet: str, line: str, column: int):
+    if re.match(r'except\s*:', snippet):
+        return local_issue('best_practices', 'medium', 'Bare except catches every exception, including KeyboardInterrupt and SystemExit', 'Catch the specific exceptions you expect, e.g. except ValueError:')
+    if re.match(r'(#|//)\s*TODO', snippet):
+        return local_issue('best_practices', 'low', 'TODO left in code', 'Resolve the TODO or track it in an issue')
+    return None
+
 def analyze_best_practices_tool(code: str, language: str) -> List[Issue]:
     """                                                          
       Analyze code for best practices issues: excpet, missing try-catch, missing type hints, magic numbers, TODO left in code                                                 
     """ 
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    issues = []
-
     special_patterns = [
         # Bare except (Python)                                           
         r'except\s*:',                                                    
@@ -212,74 +302,50 @@ def analyze_best_practices_tool(code: str, language: str) -> List[Issue]:
         r'//\s*TODO',
     ]
 
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code)
-
-        for match in matches:
-
-            line_number = code[:match.start()].count('\n') + 1
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model='gpt-5-nano',
-                messages=[
-                {'role':'system', 'content': 'You are a best practices expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
-            )
-
-            issues.append(response.choices[0].message.parsed)
-
+    # Regex patterns to find candidates
+    candidates = find_candidates(special_patterns, code)
 
     # Return List[Issue]
-    return issues
+    return run_candidates('best_practices', candidates, language, best_practices_local_check)
 
 # Tool 5
 # Test coverage tool
-def analyze_test_coverage_tool(code: str, language: str) -> List[Issue]:
-    """                                                          
-      Analyze code for test_coverage issues: finding test files for all function definitions                                                  
-    """ 
-
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    issues = []
-
-    special_patterns = [
-        # Find all function definitions                                  
-        r'^def (\w+)\(',  # Python (use re.MULTILINE)                     
-        r'^function (\w+)\(',  # JS                                       
-        r'^\s*const \w+ = \([^)]*\) =>',  # Arrow functions               
-                                                                        
-        # Find test files                                                
-        r'test_.*\.py',                                                   
-        r'.*\.test\.js',                                                  
-        r'.*\.spec\.js',
-    ]
-
-    for pattern in special_patterns:
 
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code)
+# Path of the reviewed code inside the symbol index
+SUBMITTED_PATH = '<submitted>'
 
-        for match in matches:
+def analyze_test_coverage_tool(code: str, language: str, files: Optional[Dict[str, str]] = None) -> List[Issue]:
+    """
+    Analyze code for test_coverage issues: public functions and classes that no test references.
+    Tests come from the submitted files and the checkout at SYMBOL_INDEX_ROOT, no model is asked
+    """
+    extension = '.py' if language == 'python' else '.js' if language in JS_LANGUAGES else None
+    if extension is None:
+        return []
 
-            line_number = code[:match.start()].count('\n') + 1
+    # Submitted code and files, parsed once per content hash (tools/symbol_index.py)
+    with span('symbol index', 'regex'):
+        index = SymbolIndex()
+        index.update_many(files or {})
+        index.update(SUBMITTED_PATH + extension, code)
 
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model='gpt-5-nano',
-                messages=[
-                {'role':'system', 'content': 'You are a test coverage expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
-            )
+        indexes = [index]
+        checkout = get_checkout_index()
+        if checkout is not None:
+            indexes.append(checkout)
 
-            issues.append(response.choices[0].message.parsed)
+        definitions = index.files[SUBMITTED_PATH + extension].parsed.definitions
+        untested = untested_definitions(definitions, indexes)
 
+    issues = []
+    for definition in untested:
+        issues.append(Issue(
+            type = 'test_coverage',
+            severity = 'medium',
+            message = f'Public {definition.kind} {definition.name} is not referenced by any test',
+            line_number = definition.line,
+            suggestion = f'Add a test that calls {definition.lookup_name}'
+        ))
 
     # Return List[Issue]
     return issues
@@ -291,9 +357,6 @@ def analyze_performance_tool(code: str, language: str) -> List[Issue]:
       Analyze code for performance issues: nested loops, list comprehensions, repeated operations, missing list comprehensions opportunities, N+1 query patterns                                                  
     """ 
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    issues = []
-
     special_patterns = [
         # Nested loops                                                   
         r'for.*in.*:\s*for.*in',  # Python                                
@@ -313,41 +376,24 @@ def analyze_performance_tool(code: str, language: str) -> List[Issue]:
         r'for.*:\s*.*\.get\(',
     ]
 
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code)
-
-        for match in matches:
-
-            line_number = code[:match.start()].count('\n') + 1
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model='gpt-5-nano',
-                messages=[
-                {'role':'system', 'content': 'You are a performance expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
-            )
-
-            issues.append(response.choices[0].message.parsed)
-
+    # Regex patterns to find candidates
+    candidates = find_candidates(special_patterns, code)
 
     # Return List[Issue]
-    return issues
+    return run_candidates('performance', candidates, language)
 
 # Tool 7
 # Accessibility tool
+def accessibility_local_check(snippet: str, line: str, column: int):
+    if re.match(r'<img(?![^>]*alt=)[^>]*>', snippet):
+        return local_issue('accessibility', 'high', 'Image without alt text', 'Add an alt attribute describing the image, or alt="" if it is decorative')
+    return None
+
 def analyze_accessibility_tool(code: str, language: str) -> List[Issue]:
     """
     Analyze code for accessibility issues: image w/o alt, buttons w/o text-label, links w/o text, input w/o label
     """
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    issues = []
-
     if language not in ['html', 'javascript', 'jsx', 'react', 'tsx']:
         return []
     
@@ -368,89 +414,69 @@ def analyze_accessibility_tool(code: str, language: str) -> List[Issue]:
         r'<input(?![^>]*aria-label=)(?![^>]*id=)',
     ]
 
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code)
-
-        for match in matches:
-
-            line_number = code[:match.start()].count('\n') + 1
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model='gpt-5-nano',
-                messages=[
-                {'role':'system', 'content': 'You are a accessibility expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
-            )
-
-            issues.append(response.choices[0].message.parsed)
-
+    # Regex patterns to find candidates
+    candidates = find_candidates(special_patterns, code)
 
     # Return List[Issue]
-    return issues
+    return run_candidates('accessibility', candidates, language, accessibility_local_check)
 
 # Tool 8
-# Dependency tool
-def analyze_dependency_tool(code: str, language: str) -> List[Issue]:
+# Dependency tool (local import index, LLM only for advisory notes)
+def analyze_dependency_tool(code: str, language: str, files: Optional[Dict[str, str]] = None) -> List[Issue]:
     """
-    Analyze code for dependency issues: import statement (python and js)
+    Analyze code for dependency issues: unused, duplicate and unresolved imports (python and js),
+    and packages listed in data/advisories.json. Imports resolve against the manifests in `files`
     """
-
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     issues = []
-
-    special_patterns = [
-        # Import statements                                              
-        r'^import\s+(\w+)',  # Python                                     
-        r'^from\s+(\w+)\s+import',  # Python                              
-        r'import\s+{[^}]+}\s+from\s+["\']([^"\']+)["\']\s+(\w+)\s+from',  # JS named                     
-                                                                        
-        # Unused imports (find import, search if name appears elsewhere) 
-        r'^import\s+(\w+).*$',  # Capture name, then search for it in code
-                                                                        
-        # Multiple imports from same package                             
-        # Use collections.Counter after extracting all package names
-    ]
-
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code)
-
-        for match in matches:
-
-            line_number = code[:match.start()].count('\n') + 1
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model='gpt-5-nano',
-                messages=[
-                {'role':'system', 'content': 'You are a dependency expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
+    lines = code.split('\n')
+
+    # Parsing imports and resolving them against stdlib and the project's requirements.txt / package.json
+    with span('import index', 'regex'):
+        findings = analyze_imports(code, language, files=files)
+
+    for finding in findings:
+
+        issue = Issue(
+            type = 'dependency',
+            severity = finding.severity,
+            message = f'{finding.message} (line {finding.line})',
+            line_number = finding.line,
+            suggestion = finding.suggestion
+        )
+
+        # Advisory hits get a migration note from the LLM, everything else is final
+        if finding.kind == 'advisory':
+            advisory = finding.advisory
+            note = run_cascade(
+                'dependency', lines[finding.line - 1].strip(), finding.line, language,
+                context = f'{finding.module} is flagged by the local advisory list: {advisory["message"]}. '
+                          f'Suggested replacement: {advisory["replacement"]}. Explain how to migrate this import.'
             )
+            if note is not None and note.suggestion:
+                issue.suggestion = note.suggestion
 
-            issues.append(response.choices[0].message.parsed)
-
+        issues.append(issue)
 
     # Return List[Issue]
     return issues
 
 # Tool 9
 # Documentation tool
+def documentation_local_check(snippet: str, line: str, column: int):
+    if re.match(r'#\s*(TODO|FIXME|XXX|HACK)', snippet):
+        return local_issue('documentation', 'low', 'Unresolved TODO/FIXME comment', 'Resolve it or move it to the issue tracker')
+    # only a plain assignment at the start of the line is certain, keyword arguments
+    # and other matches inside an expression go to the model
+    assignment = re.match(r'\s*(?:(?:const|let|var)\s+)?([a-hln-z])\s*=(?!=)', line)
+    if re.match(r'[a-hln-z]\s*=(?!=)', snippet) and assignment and assignment.group(1) == snippet[0]:
+        return local_issue('documentation', 'low', f'Single letter variable name "{snippet[0]}"', 'Use a descriptive variable name')
+    return None
+
 def analyze_documentation_tool(code: str, language: str) -> List[Issue]:
     """
     Analyze code for documentation issues: functions w/o (docstrings, JsDoc), classes w/o docstrings, single letter variables (i,k)
     """
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    issues = []
-
     special_patterns = [
         # Functions without docstrings (Python)                          
         r'def \w+\([^)]*\):\s*\n\s*(?!"""|\'\'\')(?!\s*#)',               
@@ -462,37 +488,14 @@ def analyze_documentation_tool(code: str, language: str) -> List[Issue]:
         r'class \w+.*:\s*\n\s*(?!""")',                                   
                                                                         
         # Single letter variable names (except i, j, k for loops)        
-        r'\b([a-hln-z])\s*=',  # Exclude i,j,k,m                          
+        r'\b([a-hln-z])\s*=(?!=)',  # Exclude i,j,k,m and == comparisons                          
                                                                         
         # TODO/FIXME comments                                            
         r'#\s*(TODO|FIXME|XXX|HACK)',
     ]
 
-    for pattern in special_patterns:
-
-        # Regex patterns to find candidates
-        matches = re.finditer(pattern, code)
-
-        for match in matches:
-
-            line_number = code[:match.start()].count('\n') + 1
-
-            # LLM to validate
-            response = client.beta.chat.completions.parse(
-                model='gpt-5-nano',
-                messages=[
-                {'role':'system', 'content': 'You are a documentation expert, that classifies severity into 3 class: critical, minor, safe'},
-                {'role':'user', 'content': f'Please analyze this code: \n{match} with its line number: {line_number}.'}
-            ],
-            response_format = Issue, # json format
-            )
-
-            issues.append(response.choices[0].message.parsed)
-
+    # Regex patterns to find candidates
+    candidates = find_candidates(special_patterns, code)
 
     # Return List[Issue]
-    return issues
-
-
-
-    
+    return run_candidates('documentation', candidates, language, documentation_local_check)
@@ -0,0 +1,45 @@
+# Shared OpenAI client so every tool and node reuses one connection pool
+
+import os
+import threading
+import httpx
+from openai import OpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the shared OpenAI client, created on first use.
+
+    LLM_MAX_CONNECTIONS  caps the HTTP connection pool (default: openai's own limits)
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = _create_client()
+    return _client
+
+
+def set_client(client):
+    """
+    Replaces the shared client, the load test harness installs its stand-in here.
+    None drops it so the next call creates a new one
+    """
+    global _client
+    with _lock:
+        _client = client
+
+
+def _create_client():
+    max_connections = int(os.getenv('LLM_MAX_CONNECTIONS', '0')) or None
+
+    if max_connections:
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=httpx.Client(limits=limits))
+
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -0,0 +1,238 @@
+# Opt-in profiling of a single /api/analyze request
+#
+# A profiled request gets:
+#   - a sampling profiler that walks the stacks of the threads running the request
+#     -> <id>.folded      collapsed stacks (flamegraph.pl, speedscope, inferno)
+#   - a timeline of graph nodes, regex scans and LLM waits
+#     -> <id>.trace.json  Chrome trace events (chrome://tracing, Perfetto)
+#
+# Requests that are not profiled only pay for a ContextVar lookup in span()
+
+import os
+import sys
+import hmac
+import json
+import logging
+import time
+import uuid
+import random
+import threading
+import functools
+from collections import Counter
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN')  # required for the request flag and for downloads
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))  # share of requests profiled automatically
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL_MS', '5')) / 1000
+PROFILE_MAX_COUNT = int(os.getenv('PROFILE_MAX_COUNT', '200'))  # profiles kept on disk, oldest are pruned
+PROFILE_MAX_AGE = float(os.getenv('PROFILE_MAX_AGE_HOURS', '168')) * 3600  # profiles older than this are pruned
+
+FORMATS = {'folded': '.folded', 'trace': '.trace.json'}
+
+logger = logging.getLogger(__name__)
+
+_active: ContextVar[Optional['RequestProfile']] = ContextVar('active_profile', default=None)
+_NO_SPAN = nullcontext()
+
+
+def authorized(token: Optional[str]) -> bool:
+    """
+    Profiling is disabled entirely when PROFILE_TOKEN is not set
+    """
+    return bool(PROFILE_TOKEN) and token is not None and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+def sampled() -> bool:
+    """
+    Sampled profiles need PROFILE_TOKEN too, without it they could never be downloaded
+    """
+    return bool(PROFILE_TOKEN) and PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def valid_profile_id(profile_id: str) -> bool:
+    return len(profile_id) == 32 and all(char in '0123456789abcdef' for char in profile_id)
+
+
+def profile_path(profile_id: str, format: str) -> str:
+    return os.path.join(PROFILE_DIR, profile_id + FORMATS[format])
+
+
+def prune_profiles():
+    """
+    Keeps at most PROFILE_MAX_COUNT profiles, none older than PROFILE_MAX_AGE
+    """
+    profiles = {}  # id -> newest mtime of its files
+    try:
+        entries = list(os.scandir(PROFILE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        profile_id = entry.name.split('.', 1)[0]
+        if not valid_profile_id(profile_id):
+            continue
+        try:
+            mtime = entry.stat().st_mtime
+        except OSError:
+            continue
+        profiles[profile_id] = max(mtime, profiles.get(profile_id, 0))
+
+    newest_first = sorted(profiles, key=profiles.get, reverse=True)
+    cutoff = time.time() - PROFILE_MAX_AGE
+    expired = [profile_id for index, profile_id in enumerate(newest_first)
+               if index >= PROFILE_MAX_COUNT or profiles[profile_id] < cutoff]
+
+    for profile_id in expired:
+        for format in FORMATS:
+            try:
+                os.remove(profile_path(profile_id, format))
+            except OSError:
+                pass
+
+
+class _Span:
+
+    def __init__(self, profile: 'RequestProfile', name: str, category: str):
+        self.profile = profile
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self.profile.thread_ids.add(self.thread_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.record(self.name, self.category, self.start, time.perf_counter(), self.thread_id)
+        return False
+
+
+def span(name: str, category: str):
+    """
+    Times a block when the current request is profiled, does nothing otherwise
+    """
+    profile = _active.get()
+    if profile is None:
+        return _NO_SPAN
+    return _Span(profile, name, category)
+
+
+def profiled_node(func):
+    """
+    Decorator for graph nodes, records node entry and exit on the timeline
+    """
+    @functools.wraps(func)
+    def wrapper(state):
+        with span(func.__name__, 'node'):
+            return func(state)
+    return wrapper
+
+
+class _Sampler(threading.Thread):
+    """
+    Samples the stacks of every thread that worked on the profiled request
+    """
+
+    def __init__(self, profile: 'RequestProfile'):
+        super().__init__(name=f'profiler-{profile.id[:8]}', daemon=True)
+        self.profile = profile
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(PROFILE_INTERVAL):
+            frames = sys._current_frames()
+            for thread_id in list(self.profile.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.profile.samples[_collapse(frame)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.thread_ids = {threading.get_ident()}
+        self.samples: Counter = Counter()
+        self.events = []
+        self.start = time.perf_counter()
+        self._token = None
+        self._sampler = _Sampler(self)
+        self.saved = False
+
+    def record(self, name: str, category: str, start: float, end: float, thread_id: int):
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - self.start) * 1e6),
+            'dur': round((end - start) * 1e6),
+            'pid': os.getpid(),
+            'tid': thread_id,
+        })
+
+    def __enter__(self):
+        self._token = _active.set(self)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._sampler.stop()
+        _active.reset(self._token)
+        # a profile that cannot be written must not fail the request it measured
+        try:
+            self.save(time.perf_counter() - self.start)
+            self.saved = True
+        except OSError:
+            logger.exception('Could not save profile %s', self.id)
+        return False
+
+    def totals(self) -> dict:
+        """
+        Time spent per category in ms (nested spans are counted in both)
+        """
+        totals: dict = {}
+        for event in self.events:
+            totals[event['cat']] = totals.get(event['cat'], 0) + event['dur'] / 1000
+        return {category: round(ms, 1) for category, ms in totals.items()}
+
+    def save(self, elapsed: float):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+
+        with open(profile_path(self.id, 'folded'), 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+
+        trace = {
+            'traceEvents': sorted(self.events, key=lambda event: event['ts']),
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'profile_id': self.id,
+                'total_ms': round(elapsed * 1000, 1),
+                'samples': sum(self.samples.values()),
+                'sample_interval_ms': PROFILE_INTERVAL * 1000,
+                'category_ms': self.totals(),
+            },
+        }
+        with open(profile_path(self.id, 'trace'), 'w') as f:
+            json.dump(trace, f)
+
+        prune_profiles()
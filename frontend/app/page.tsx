@@ -2,6 +2,7 @@
 import { useState } from 'react'
 import CodeInput from '@/components/CodeInput'
 import LanguageSelector from '@/components/LanguageSelector'
+import ResultsDisplay from '@/components/ResultsDisplays'
 
 export default function Home() {
 
@@ -50,7 +51,8 @@ export default function Home() {
           'Content-Type': 'application/json'
         },
         // JSON.stringify: converts JS object to JSON string
-        body: JSON.stringify({ code, language}),
+        // issues are fetched page by page by ResultsDisplay, skip them here
+        body: JSON.stringify({ code, language, include_issues: false }),
       })
 
       if (!response.ok) {
@@ -119,28 +121,11 @@ export default function Home() {
         <div className="bg-white rounded-lg shadow p-6">
           <h2 className="text-xl font-semibold mb-4 text-gray-900">Analysis Results</h2>
 
-          {/* Conditional rendering with && */}
-          {loading && <p className="text-gray-500">Analyzing your code...</p>}
-
-          {results && (
-            <div>
-              {/* Optional chaining ?.: safely access nested properties */}
-              {/* || operator: provides fallback value */}
-              <p className="text-sm text-gray-900">
-                Total issues: {results.metrics?.total_issues || 0}
-              </p>
-
-              {/* JSON.stringify(obj, null, 2): formats object as indented string */}
-              <pre className="mt-4 text-xs overflow-auto max-h-96 text-gray-900 bg-gray-50 p-4 rounded">
-                {JSON.stringify(results, null, 2)}
-              </pre>
-            </div>
-          )}
-
-          {/* ! operator: logical NOT (negates boolean) */}
-          {!loading && !results && (
-            <p className="text-gray-900">Results will appear here after analysis</p>
-          )}
+          {/* Metrics, summary and paginated issues (critical first) */}
+          <ResultsDisplay
+            results={results}
+            loading={loading}
+          />
 
         </div>
       </div>
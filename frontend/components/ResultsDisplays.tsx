@@ -1,21 +1,103 @@
 'use client'
 
-import React from 'react'
+import React, { useEffect, useState } from 'react'
+
+const API_URL = 'http://localhost:8000'
+const PAGE_SIZE = 25
 
 // Props interface
 interface ResultsDisplayProps {
-    results: any // Analysis results from API
+    results: any // Analysis results from API (review_id, or the full issue list if the review was not stored)
     loading: boolean // Whether analysis is in progress
 }
 
+// Badge colors for each severity
+const SEVERITY_STYLES: Record<string, string> = {
+    critical: 'bg-red-100 text-red-700',
+    high: 'bg-orange-100 text-orange-700',
+    medium: 'bg-yellow-100 text-yellow-700',
+    low: 'bg-green-100 text-green-700',
+}
+
+const SEVERITIES = ['critical', 'high', 'medium', 'low']
+
 export default function ResultsDisplay({ results, loading}: ResultsDisplayProps) {
 
+    // Issues loaded so far, server returns them critical first
+    const [issues, setIssues] = useState<any[]>([])
+
+    // Cursor of the next page, null when everything is loaded
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
+
+    // Severity filter, null shows every severity
+    const [severity, setSeverity] = useState<string | null>(null)
+
+    // Severity aggregates computed by the backend
+    const [metrics, setMetrics] = useState<any>(null)
+
+    const [loadingPage, setLoadingPage] = useState(false)
+    const [error, setError] = useState('')
+
+    const reviewId = results?.review_id
+
+    // Fetch one page of issues from the review store
+    const fetchPage = async (cursor: string | null, reset: boolean) => {
+        // Review was not stored, the response already holds every issue
+        if (!reviewId) {
+            const all = results?.issues || []
+            setIssues(severity ? all.filter((issue: any) => issue.severity === severity) : all)
+            setNextCursor(null)
+            return
+        }
+
+        setLoadingPage(true)
+        setError('')
+
+        const params = new URLSearchParams({ limit: String(PAGE_SIZE) })
+        if (severity) params.append('severity', severity)
+        if (cursor) params.append('cursor', cursor)
+
+        try {
+            const response = await fetch(`${API_URL}/api/reviews/${reviewId}/issues?${params}`)
+            if (!response.ok) {
+                throw new Error('Failed to load issues')
+            }
+
+            const data = await response.json()
+            setIssues(reset ? data.issues : [...issues, ...data.issues])
+            setNextCursor(data.next_cursor)
+        } catch (err) {
+            setError('Failed to load issues')
+        } finally {
+            setLoadingPage(false)
+        }
+    }
+
+    // Load the metrics once per review
+    useEffect(() => {
+        // Not stored, drop the previous review's counts and use the response metrics
+        if (!reviewId) {
+            setMetrics(null)
+            return
+        }
+
+        fetch(`${API_URL}/api/reviews/${reviewId}/metrics`)
+            .then((response) => response.json())
+            .then((data) => setMetrics(data.metrics))
+            .catch(() => setMetrics(results?.metrics))
+    }, [results, reviewId])
+
+    // Reload the first page when the review or the filter changes
+    useEffect(() => {
+        fetchPage(null, true)
+    }, [results, severity])
+
     // Show loading state
     if (loading) {
         return (
             <div className='flex items-center justify-center h-64'>
-                <div className='="text-center'>
-                    <div className='animate-spin roudned-full h-12 w-12 border-b-2 border-blue-600 mx-auto mb-4'></div>
+                <div className='text-center'>
+                    <div className='animate-spin rounded-full h-12 w-12 border-b-2 border-blue-600 mx-auto mb-4'></div>
                     <p className='text-gray-700'>Analyzing your code...</p>
                     <p className='text-sm text-gray-700 mt-2'>This may take 30-60 seconds, depending on the amount of the code</p>
                 </div>
@@ -32,41 +114,32 @@ export default function ResultsDisplay({ results, loading}: ResultsDisplayProps)
         )
     }
 
-    // Show results ()
-    if (results) {
-        return (
-            <div className='space-y-6'>
-                {/* 1. METRICS CARDS */}
-                <h3 className='text-lg font-semibold text-gray-900 mb-3'>Metrics Overview</h3>
-
-                {/* Grid of 5 cards */}
-                <div className='bg-blue-50 border border-blue-200 rounded-lg p-4 text-center'>
-                    <p className='text-2xl font-bold text-blue-200'>5</p>
-                    <p className='text-sm text-blue-600'>Total Issues</p>
-                </div>
-
-                {/* Critical Card */}
-                <div className='bg-red-50 border border-red-200 rounded-lg p-4 text-center'>
-                    <p className='text-2xl font-bold text-red-700'>2</p>
-                    <p className='text-sm text-red-600'>Critical</p>
-                </div>
+    const counts = metrics || results.metrics || {}
 
-                {/* High Card */}
-                <div className='bg-red-50 border border-red-200 rounded-lg p-4 text-center'>
-                    <p className='text-2xl font-bold text-red-700'>2</p>
-                    <p className='text-sm text-orange-600'>High</p>
-                </div>
+    return (
+        <div className='space-y-6'>
+            {/* 1. METRICS CARDS */}
+            <div>
+                <h3 className='text-lg font-semibold text-gray-900 mb-3'>Metrics Overview</h3>
 
-                {/* Medium Card */}
-                <div className='bg-red-50 border border-red-200 rounded-lg p-4 text-center'>
-                    <p className='text-2xl font-bold text-red-700'>2</p>
-                    <p className='text-sm text-yellow-600'>Medium</p>
-                </div>
+                <div className='grid grid-cols-5 gap-3'>
+                    {/* Total Card */}
+                    <div className='bg-blue-50 border border-blue-200 rounded-lg p-4 text-center'>
+                        <p className='text-2xl font-bold text-blue-700'>{counts.total_issues || 0}</p>
+                        <p className='text-sm text-blue-600'>Total Issues</p>
+                    </div>
 
-                {/* Low Card */}
-                <div className='bg-red-50 border border-red-200 rounded-lg p-4 text-center'>
-                    <p className='text-2xl font-bold text-red-700'>2</p>
-                    <p className='text-sm text-green-600'>Low</p>
+                    {/* One card per severity, clicking filters the list */}
+                    {SEVERITIES.map((level) => (
+                        <button
+                            key={level}
+                            onClick={() => setSeverity(severity === level ? null : level)}
+                            className={`border rounded-lg p-4 text-center ${severity === level ? 'border-blue-600' : 'border-gray-200'}`}
+                        >
+                            <p className='text-2xl font-bold text-gray-900'>{counts[level] || 0}</p>
+                            <p className='text-sm text-gray-600 capitalize'>{level}</p>
+                        </button>
+                    ))}
                 </div>
             </div>
 
@@ -74,54 +147,79 @@ export default function ResultsDisplay({ results, loading}: ResultsDisplayProps)
             <div>
                 <h3 className='text-lg font-semibold text-gray-900 mb-3'>Summary</h3>
                 <div className='bg-blue-50 border border-blue-200 rounded-lg p-4'>
-                    <p className='text-gray-800'>
-                        Code has blablabla
+                    <p className='text-gray-800 whitespace-pre-line'>
+                        {results.summary}
                     </p>
                 </div>
             </div>
 
             {/* ISSUES LIST */}
             <div>
-                <h3 className='text=lg font-semibold text-gray-900 mb-3'>
-                    Issues Found
+                <h3 className='text-lg font-semibold text-gray-900 mb-3'>
+                    Issues Found {severity && <span className='text-sm text-gray-500'>({severity} only)</span>}
                 </h3>
 
-                <div className='space-y-3'>
-
-                    {/* Issue Card */}
-                    <div className='border border-gray-200 rounded-lh p-4'>
-
-                        {/* Issue Header */}
-                        <div className='flex items-start justify-between mb-2'>
-                            <div className='flex items-center gap-2'>
-                                {/* Severity Badge */}
-                                <span className="px-2 py-1 text-xs font-semibold rounded bg-red-100 text-red-700">
-                                    CRITICAL
-                                </span>
+                {error && (
+                    <div className='mb-3 p-3 bg-red-100 text-red-700 rounded'>
+                        {error}
+                    </div>
+                )}
 
-                                {/* Issue Type */}
-                                <span className='text-sm text-gray-400'>security</span>
+                <div className='space-y-3'>
+                    {issues.map((issue, index) => (
+                        // Issue Card
+                        <div key={index} className='border border-gray-200 rounded-lg p-4'>
+
+                            {/* Issue Header */}
+                            <div className='flex items-start justify-between mb-2'>
+                                <div className='flex items-center gap-2'>
+                                    {/* Severity Badge */}
+                                    <span className={`px-2 py-1 text-xs font-semibold rounded ${SEVERITY_STYLES[issue.severity] || ''}`}>
+                                        {issue.severity.toUpperCase()}
+                                    </span>
+
+                                    {/* Issue Type */}
+                                    <span className='text-sm text-gray-400'>{issue.type}</span>
+                                </div>
+
+                                {/* Line Number */}
+                                {issue.line_number && (
+                                    <span className='text-sm text-gray-400'>Line {issue.line_number}</span>
+                                )}
                             </div>
 
-                            {/* Line Number */}
-                            <span className="text-sm text-gray-400">Line 2</span>
-                        </div>
-
-                        {/* Issue Message */}
-                        <p className='text-gray-900 font-medium mb-2'>
-                            Hardcoded password detected
-                        </p>
-
-                        {/* Suggestion */}
-                        <div className='bg-gray-50 rounded p-2 mt-2'>
-                            <p className='text-sm text-gray-700'>
-                                <span className='font-semibold'>Suggestion:</span> Use environment variables instead
+                            {/* Issue Message */}
+                            <p className='text-gray-900 font-medium mb-2'>
+                                {issue.message}
                             </p>
+
+                            {/* Suggestion */}
+                            {issue.suggestion && (
+                                <div className='bg-gray-50 rounded p-2 mt-2'>
+                                    <p className='text-sm text-gray-700'>
+                                        <span className='font-semibold'>Suggestion:</span> {issue.suggestion}
+                                    </p>
+                                </div>
+                            )}
                         </div>
-                    </div>
+                    ))}
+
+                    {!loadingPage && issues.length === 0 && (
+                        <p className='text-gray-700'>No issues found</p>
+                    )}
                 </div>
 
+                {/* Next page of issues */}
+                {nextCursor && (
+                    <button
+                        onClick={() => fetchPage(nextCursor, false)}
+                        disabled={loadingPage}
+                        className='mt-4 w-full border border-gray-300 text-gray-700 py-2 rounded-lg hover:bg-gray-50 disabled:text-gray-400'
+                    >
+                        {loadingPage ? 'Loading...' : 'Load more issues'}
+                    </button>
+                )}
             </div>
-        )
-    }
-}
\ No newline at end of file
+        </div>
+    )
+}